@@ -19,7 +19,7 @@ CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     first_name VARCHAR(255) NOT NULL,
     last_name VARCHAR(255) NOT NULL,
-    email VARCHAR(255) NOT NULL UNIQUE,
+    email VARCHAR(255) NOT NULL,
     password VARCHAR(255) NOT NULL,
     role_id role_enum NOT NULL DEFAULT 'user',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -49,23 +49,65 @@ CREATE TABLE IF NOT EXISTS likes (
 
 -- Create indexes if they don't exist
 DO $$ 
+DECLARE
+    email_case_duplicates TEXT;
 BEGIN
-    -- Create index for vacations.country_id if it doesn't exist
+    -- Create index for vacations (country_id, start_date) if it doesn't exist;
+    -- serves country filters and the default start_date ordering within a country
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_indexes 
+        WHERE tablename = 'vacations' AND indexname = 'idx_vacations_country_start'
+    ) THEN
+        CREATE INDEX idx_vacations_country_start ON vacations(country_id, start_date);
+    END IF;
+
+    -- The composite index above covers country_id lookups on its own
+    DROP INDEX IF EXISTS idx_vacations_country_id;
+
+    -- Create index for vacations.start_date if it doesn't exist
     IF NOT EXISTS (
         SELECT 1 FROM pg_indexes 
-        WHERE tablename = 'vacations' AND indexname = 'idx_vacations_country_id'
+        WHERE tablename = 'vacations' AND indexname = 'idx_vacations_start_date'
     ) THEN
-        CREATE INDEX idx_vacations_country_id ON vacations(country_id);
+        CREATE INDEX idx_vacations_start_date ON vacations(start_date);
     END IF;
 
-    -- Create index for likes.user_id if it doesn't exist
+    -- Create index for vacations.price if it doesn't exist
     IF NOT EXISTS (
         SELECT 1 FROM pg_indexes 
-        WHERE tablename = 'likes' AND indexname = 'idx_likes_user_id'
+        WHERE tablename = 'vacations' AND indexname = 'idx_vacations_price'
     ) THEN
-        CREATE INDEX idx_likes_user_id ON likes(user_id);
+        CREATE INDEX idx_vacations_price ON vacations(price);
     END IF;
 
+    -- Create case-insensitive unique index for users.email if it doesn't exist
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_indexes 
+        WHERE tablename = 'users' AND indexname = 'idx_users_email_lower'
+    ) THEN
+        -- users_email_key only rejected exact duplicates, so existing rows may
+        -- differ by case alone; those must be merged or renamed first
+        SELECT string_agg(emails, '; ') INTO email_case_duplicates
+        FROM (
+            SELECT string_agg(email, ', ' ORDER BY id) AS emails
+            FROM users
+            GROUP BY lower(email)
+            HAVING COUNT(*) > 1
+        ) duplicates;
+        IF email_case_duplicates IS NOT NULL THEN
+            RAISE EXCEPTION 'Cannot create idx_users_email_lower: emails differ only by case: %',
+                email_case_duplicates
+                USING HINT = 'Merge or rename these users, then rerun the schema.';
+        END IF;
+        CREATE UNIQUE INDEX idx_users_email_lower ON users (lower(email));
+    END IF;
+
+    -- The case-insensitive index above also rejects exact duplicates
+    ALTER TABLE users DROP CONSTRAINT IF EXISTS users_email_key;
+
+    -- likes.user_id lookups use the UNIQUE (user_id, vacation_id) index
+    DROP INDEX IF EXISTS idx_likes_user_id;
+
     -- Create index for likes.vacation_id if it doesn't exist
     IF NOT EXISTS (
         SELECT 1 FROM pg_indexes 
@@ -75,6 +117,36 @@ BEGIN
     END IF;
 END $$;
 
+-- Create trigram indexes for substring (ILIKE '%term%') search when pg_trgm is available
+DO $$ 
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+        -- Create trigram index for countries.name if it doesn't exist
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_indexes 
+            WHERE tablename = 'countries' AND indexname = 'idx_countries_name_trgm'
+        ) THEN
+            CREATE INDEX idx_countries_name_trgm ON countries USING GIN (name gin_trgm_ops);
+        END IF;
+
+        -- Search matches destination and description through one expression,
+        -- so a single trigram index serves both instead of two ORed ones
+        DROP INDEX IF EXISTS idx_vacations_destination_trgm;
+        DROP INDEX IF EXISTS idx_vacations_description_trgm;
+
+        -- Create trigram index for the vacation search text if it doesn't exist
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_indexes 
+            WHERE tablename = 'vacations' AND indexname = 'idx_vacations_search_trgm'
+        ) THEN
+            CREATE INDEX idx_vacations_search_trgm ON vacations
+                USING GIN ((destination || E'\n' || coalesce(description, '')) gin_trgm_ops);
+        END IF;
+    END IF;
+END $$;
+
 -- Insert sample data in correct order
 DO $$
 DECLARE
@@ -117,7 +189,7 @@ BEGIN
     -- Insert admin user if doesn't exist and get ID
     INSERT INTO users (first_name, last_name, email, password, role_id)
     VALUES ('Admin', 'User', 'admin@example.com', 'hashed_password_here', 'admin')
-    ON CONFLICT (email) DO UPDATE SET email = EXCLUDED.email
+    ON CONFLICT ((lower(email))) DO UPDATE SET email = EXCLUDED.email
     RETURNING id INTO admin_id;
 
     -- Insert sample vacations
@@ -1,19 +1,130 @@
 """
 Authentication service that handles JWT token generation and verification.
 """
+import base64
+import hashlib
+import hmac
+import json
+import logging
 import os
+import threading
+import time
+from calendar import timegm
 from typing import Optional, Tuple, Dict, Any
 from datetime import datetime, timedelta, UTC
 import jwt
 from src.models.User import User
 from src.DAL.UserService import UserService
 
+logger = logging.getLogger(__name__)
+
+# JWT configuration, resolved once at import time
+_SECRET = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
+_EXPIRY_HOURS = int(os.getenv('JWT_EXPIRY_HOURS', '24'))
+_ALG = 'HS256'
+_ALGORITHMS = [_ALG]
+_EXP_DELTA = timedelta(hours=_EXPIRY_HOURS)
+_RESET_EXP_DELTA = timedelta(hours=1)  # Reset tokens expire in 1 hour
+_REQUIRED_CLAIMS = ['exp', 'sub', 'email', 'role_id']
+_DECODE_OPTIONS = {'require': _REQUIRED_CLAIMS}
+_SECRET_BYTES = _SECRET.encode('utf-8')
+_TIME_CLAIMS = ('iat', 'exp', 'nbf')
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as required by RFC 7515."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _hmac_pads(key: bytes) -> Tuple[Any, Any]:
+    """
+    Build the keyed inner/outer SHA-256 states for HMAC (RFC 2104).
+
+    Args:
+        key: HMAC key
+
+    Returns:
+        Tuple of (inner, outer) hash objects with the ipad/opad block absorbed
+    """
+    block_size = hashlib.sha256().block_size
+    if len(key) > block_size:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(block_size, b'\x00')
+    inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+    outer = hashlib.sha256(bytes(b ^ 0x5c for b in key))
+    return inner, outer
+
+
+# The secret is fixed for the process, so the keyed HMAC states are built once
+# and copied per signature instead of re-running key setup every time
+_HMAC_INNER, _HMAC_OUTER = _hmac_pads(_SECRET_BYTES)
+
+
+def _hmac_sha256(message: bytes) -> bytes:
+    """Compute HMAC-SHA256 of a message with the JWT secret."""
+    inner = _HMAC_INNER.copy()
+    inner.update(message)
+    outer = _HMAC_OUTER.copy()
+    outer.update(inner.digest())
+    return outer.digest()
+
+
+def _token_key(token: str) -> bytes:
+    """Derive the verified-token cache key, so raw tokens are never retained."""
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+# The JOSE header never changes, so it is serialized once
+_HEADER_B64 = _b64url(
+    json.dumps({'alg': _ALG, 'typ': 'JWT'}, separators=(',', ':')).encode('utf-8')
+)
+
+
+def _encode_token(payload: Dict[str, Any]) -> str:
+    """
+    Sign a payload as an HS256 JWT.
+
+    Produces the same compact serialization as jwt.encode, without going
+    through PyJWT's algorithm dispatch and header handling on every call.
+
+    Args:
+        payload: Token claims; datetime values for iat/exp/nbf are converted
+            to unix timestamps
+
+    Returns:
+        Signed JWT string
+    """
+    for claim in _TIME_CLAIMS:
+        value = payload.get(claim)
+        if isinstance(value, datetime):
+            payload[claim] = timegm(value.utctimetuple())
+
+    payload_b64 = _b64url(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+    signing_input = _HEADER_B64 + b'.' + payload_b64
+    signature = _hmac_sha256(signing_input)
+    return (signing_input + b'.' + _b64url(signature)).decode('ascii')
+
 
 class AuthService:
     # Default values for JWT configuration
-    JWT_SECRET = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
-    JWT_EXPIRY_HOURS = int(os.getenv('JWT_EXPIRY_HOURS', '24'))
-    JWT_ALGORITHM = 'HS256'
+    JWT_SECRET = _SECRET
+    JWT_EXPIRY_HOURS = _EXPIRY_HOURS
+    JWT_ALGORITHM = _ALG
+    JWT_REQUIRED_CLAIMS = _REQUIRED_CLAIMS
+
+    # Verified-token cache: SHA-256 of the token -> (user row, expiry as a unix
+    # timestamp). Keying by digest keeps bearer tokens out of process memory.
+    # Rows rather than User objects are kept, so callers can't mutate what
+    # later requests see. Entries never outlive the token's own 'exp' claim;
+    # UserService drops a user's entries when it updates or deletes them, and
+    # TOKEN_CACHE_TTL_SECONDS bounds staleness from writes made elsewhere.
+    TOKEN_CACHE_MAX_SIZE = 10_000
+    TOKEN_CACHE_TTL_SECONDS = 300
+    _token_cache: Dict[bytes, Tuple[Dict[str, Any], float]] = {}
+    _token_cache_lock = threading.RLock()
+    # Bumped on every user invalidation, so a verification that loaded the
+    # user before a concurrent update or delete doesn't cache the old row
+    _token_cache_version = 0
 
     @classmethod
     def register(cls, first_name: str, last_name: str, email: str, password: str) -> User:
@@ -32,17 +143,17 @@ class AuthService:
         Raises:
             ValueError: If the email is already registered
         """
-        if UserService.exists(email):
-            raise ValueError("Email already registered")
-
         user = User(
             first_name=first_name,
             last_name=last_name,
             email=email,
             password=password  # Password will be hashed by the User model
         )
-        
-        return UserService.create(user)
+
+        try:
+            return UserService.create(user)
+        except ValueError as e:
+            raise ValueError("Email already registered") from e
 
     @classmethod
     def login(cls, email: str, password: str) -> Tuple[User, str]:
@@ -63,6 +174,10 @@ class AuthService:
         if not user or not user.verify_password(password):
             raise ValueError("Invalid email or password")
 
+        # Transparently upgrade legacy bcrypt / outdated Argon2 hashes
+        if user.needs_rehash():
+            UserService.update_password(user.id, password)
+
         token = cls.generate_token(user)
         return user, token
 
@@ -83,9 +198,9 @@ class AuthService:
             'email': user.email,
             'role_id': user.role_id,
             'iat': now,
-            'exp': now + timedelta(hours=cls.JWT_EXPIRY_HOURS)
+            'exp': now + _EXP_DELTA
         }
-        return jwt.encode(payload, cls.JWT_SECRET, algorithm=cls.JWT_ALGORITHM)
+        return _encode_token(payload)
 
     @classmethod
     def verify_token(cls, token: str) -> Optional[User]:
@@ -98,34 +213,63 @@ class AuthService:
         Returns:
             User object if token is valid, None otherwise
         """
+        cached = cls._get_cached_token(token)
+        if cached:
+            return cached
+        version = cls._token_cache_version
+
         try:
-            payload = jwt.decode(token, cls.JWT_SECRET, algorithms=[cls.JWT_ALGORITHM])
-            print(f"Token payload: {payload}")  # Debug print
-            
+            payload = jwt.decode(
+                token,
+                _SECRET,
+                algorithms=_ALGORITHMS,
+                options=_DECODE_OPTIONS
+            )
+            logger.debug("Token payload: %s", payload)
+
             user = UserService.get_by_id(payload['sub'])
             if not user:
-                print("User not found")  # Debug print
+                logger.debug("User not found: %s", payload['sub'])
                 return None
-            
-            print(f"User: {user.to_dict()}")  # Debug print
-            
-            # Verify email and role match
-            if user.email != payload['email']:
-                print("Email mismatch")  # Debug print
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("User: %s", user.to_dict())
+
+            # Verify email and role still match (constant-time comparison)
+            if not cls._claims_match(user.email, payload['email']):
+                logger.debug("Email mismatch for user %s", user.id)
                 return None
-                
-            if user.role_id != payload['role_id']:
-                print(f"Role mismatch: {user.role_id} != {payload['role_id']}")  # Debug print
+
+            if not cls._claims_match(user.role_id, payload['role_id']):
+                logger.debug("Role mismatch: %s != %s", user.role_id, payload['role_id'])
                 return None
-                
+
+            cls._cache_token(token, user, payload['exp'], version)
             return user
         except jwt.InvalidTokenError as e:
-            print(f"Invalid token: {e}")  # Debug print
+            logger.debug("Invalid token: %s", e)
             return None
         except Exception as e:
-            print(f"Unexpected error: {e}")  # Debug print
+            logger.warning("Unexpected error while verifying token: %s", e)
             return None
 
+    @staticmethod
+    def _claims_match(actual: Any, claimed: Any) -> bool:
+        """
+        Compare a stored value with a token claim in constant time.
+
+        Args:
+            actual: Value currently stored for the user
+            claimed: Value carried in the token
+
+        Returns:
+            True if both values are equal
+        """
+        return hmac.compare_digest(
+            str(actual).encode('utf-8'),
+            str(claimed).encode('utf-8')
+        )
+
     @classmethod
     def change_password(cls, user_id: int, old_password: str, new_password: str) -> bool:
         """
@@ -146,7 +290,9 @@ class AuthService:
         if not user or not user.verify_password(old_password):
             raise ValueError("Current password is incorrect")
 
-        return UserService.update_password(user_id, new_password)
+        updated = UserService.update_password(user_id, new_password)
+        cls.invalidate_user_tokens(user_id)
+        return updated
 
     @classmethod
     def request_password_reset(cls, email: str) -> Optional[str]:
@@ -170,9 +316,9 @@ class AuthService:
             'email': user.email,
             'type': 'reset',
             'iat': now,
-            'exp': now + timedelta(hours=1)  # Reset tokens expire in 1 hour
+            'exp': now + _RESET_EXP_DELTA
         }
-        return jwt.encode(payload, cls.JWT_SECRET, algorithm=cls.JWT_ALGORITHM)
+        return _encode_token(payload)
 
     @classmethod
     def reset_password(cls, reset_token: str, new_password: str) -> bool:
@@ -190,7 +336,7 @@ class AuthService:
             ValueError: If token is invalid or expired
         """
         try:
-            payload = jwt.decode(reset_token, cls.JWT_SECRET, algorithms=[cls.JWT_ALGORITHM])
+            payload = jwt.decode(reset_token, _SECRET, algorithms=_ALGORITHMS)
             
             # Verify it's a reset token
             if payload.get('type') != 'reset':
@@ -202,7 +348,9 @@ class AuthService:
                 raise ValueError("Invalid reset token")
 
             # Set new password
-            return UserService.update_password(user.id, new_password)
+            updated = UserService.update_password(user.id, new_password)
+            cls.invalidate_user_tokens(user.id)
+            return updated
 
         except jwt.InvalidTokenError:
             raise ValueError("Invalid or expired reset token")
@@ -224,6 +372,7 @@ class AuthService:
         user = cls.verify_token(token)
         if not user:
             raise ValueError("Invalid or expired token")
+        cls.invalidate_token(token)
 
         # Generate new token with extended expiry
         now = datetime.now(UTC)
@@ -232,7 +381,104 @@ class AuthService:
             'email': user.email,
             'role_id': user.role_id,
             'iat': now,
-            'exp': now + timedelta(hours=cls.JWT_EXPIRY_HOURS),
+            'exp': now + _EXP_DELTA,
             'jti': str(now.timestamp())  # Add a unique token ID
         }
-        return jwt.encode(payload, cls.JWT_SECRET, algorithm=cls.JWT_ALGORITHM) 
\ No newline at end of file
+        return _encode_token(payload)
+
+    @classmethod
+    def invalidate_token(cls, token: str) -> None:
+        """
+        Remove a token from the verified-token cache.
+
+        Args:
+            token: JWT token to forget
+        """
+        with cls._token_cache_lock:
+            cls._token_cache.pop(_token_key(token), None)
+
+    @classmethod
+    def invalidate_user_tokens(cls, user_id: int) -> None:
+        """
+        Remove every cached token belonging to a user.
+
+        Args:
+            user_id: ID of the user whose tokens should be re-verified
+        """
+        with cls._token_cache_lock:
+            cls._token_cache_version += 1
+            stale = [
+                key for key, (row, _) in cls._token_cache.items()
+                if row['id'] == user_id
+            ]
+            for key in stale:
+                del cls._token_cache[key]
+
+    @classmethod
+    def clear_token_cache(cls) -> None:
+        """Remove all entries from the verified-token cache."""
+        with cls._token_cache_lock:
+            cls._token_cache_version += 1
+            cls._token_cache.clear()
+
+    @classmethod
+    def _get_cached_token(cls, token: str) -> Optional[User]:
+        """
+        Look up a previously verified token.
+
+        Args:
+            token: JWT token to look up
+
+        Returns:
+            A fresh User built from the cached row if present and not
+            expired, None otherwise
+        """
+        key = _token_key(token)
+        with cls._token_cache_lock:
+            entry = cls._token_cache.get(key)
+            if not entry:
+                return None
+            row, expires_at = entry
+            if expires_at <= time.time():
+                del cls._token_cache[key]
+                return None
+        return User.from_db_row(row)
+
+    @classmethod
+    def _cache_token(cls, token: str, user: User, exp: float, version: int) -> None:
+        """
+        Store a verified token until its expiry (or the cache TTL, if sooner).
+
+        Args:
+            token: Verified JWT token
+            user: User the token belongs to
+            exp: Token 'exp' claim as a unix timestamp
+            version: _token_cache_version read before the user was loaded;
+                nothing is stored if users were invalidated since
+        """
+        now = time.time()
+        expires_at = min(exp, now + cls.TOKEN_CACHE_TTL_SECONDS)
+        if expires_at <= now:
+            return
+
+        row = {
+            'id': user.id,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email,
+            'password': user.password_hash,
+            'role_id': user.role_id,
+            'created_at': user.created_at
+        }
+        key = _token_key(token)
+        with cls._token_cache_lock:
+            if version != cls._token_cache_version:
+                return
+            # Re-insert at the end, so dict order stays insertion order
+            cls._token_cache.pop(key, None)
+            # With a fixed TTL, insertion order closely tracks expiry, so
+            # evicting the oldest insertion is O(1) and drops the entry
+            # closest to expiring; expired entries are removed on lookup
+            while len(cls._token_cache) >= cls.TOKEN_CACHE_MAX_SIZE:
+                del cls._token_cache[next(iter(cls._token_cache))]
+            cls._token_cache[key] = (row, expires_at)
@@ -1,6 +1,34 @@
-from typing import List, Optional
-from src.query import query
+from functools import lru_cache
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional
+from psycopg import errors
+from src.query import query, stream
 from src.models.Country import Country
+from src.DAL.VacationService import VacationService
+
+# Bumped on every write so cached lookups miss on their version key
+_cache_version = 0
+
+
+def _invalidate_cache():
+    """Invalidate cached country lookups."""
+    global _cache_version
+    _cache_version += 1
+
+
+@lru_cache(maxsize=1024)
+def _fetch_by_id(country_id: int, version: int) -> Optional[Dict]:
+    """Fetch a country row by ID, cached per cache version."""
+    result = query("SELECT * FROM countries WHERE id = %s", [country_id])
+    return result[0] if result else None
+
+
+@lru_cache(maxsize=1024)
+def _fetch_by_code(code: str, version: int) -> Optional[Dict]:
+    """Fetch a country row by code, cached per cache version."""
+    result = query("SELECT * FROM countries WHERE code = %s", [code])
+    return result[0] if result else None
+
 
 class CountryService:
     @staticmethod
@@ -15,49 +43,90 @@ class CountryService:
             Created country with ID
             
         Raises:
-            ValueError: If country with same code already exists
+            ValueError: If country with same code or name already exists
         """
-        if CountryService.get_by_code(country.code):
-            raise ValueError(f"Country with code {country.code} already exists")
-
         sql = """
             INSERT INTO countries (name, code)
             VALUES (%s, %s)
             RETURNING *
         """
         params = [country.name, country.code]
-        result = query(sql, params, commit=True)
-        return Country.from_dict(result[0])
+        try:
+            result = query(sql, params, commit=True)
+        except errors.UniqueViolation as e:
+            if e.diag.constraint_name == 'countries_name_key':
+                raise ValueError(f"Country with name {country.name} already exists") from e
+            raise ValueError(f"Country with code {country.code} already exists") from e
+        _invalidate_cache()
+        return Country.from_db_row(result[0])
+
+    @staticmethod
+    def create_many(countries: List[Country]) -> List[Country]:
+        """
+        Create many countries in a single statement.
+
+        Args:
+            countries: Country objects to create
+
+        Returns:
+            Created countries with IDs
+
+        Raises:
+            ValueError: If any country's code or name already exists; no
+                country is created in that case
+        """
+        if not countries:
+            return []
+
+        sql = """
+            INSERT INTO countries (name, code)
+            SELECT * FROM unnest(%s::text[], %s::text[])
+            RETURNING *
+        """
+        params = [
+            [country.name for country in countries],
+            [country.code for country in countries]
+        ]
+        try:
+            result = query(sql, params, commit=True)
+        except errors.UniqueViolation as e:
+            if e.diag.constraint_name == 'countries_name_key':
+                raise ValueError("One or more country names already exist") from e
+            raise ValueError("One or more country codes already exist") from e
+        _invalidate_cache()
+        return [Country.from_db_row(row) for row in result]
 
     @staticmethod
     def get_by_id(country_id: int) -> Optional[Country]:
         """
         Get country by ID.
         
+        Lookups are cached until the next create/update/delete.
+
         Args:
             country_id: Country ID
             
         Returns:
             Country object if found, None otherwise
         """
-        sql = "SELECT * FROM countries WHERE id = %s"
-        result = query(sql, [country_id])
-        return Country.from_dict(result[0]) if result else None
+        row = _fetch_by_id(country_id, _cache_version)
+        return Country.from_db_row(row) if row else None
 
     @staticmethod
     def get_by_code(code: str) -> Optional[Country]:
         """
         Get country by code.
         
+        Lookups are cached until the next create/update/delete.
+
         Args:
             code: Two-letter ISO country code
             
         Returns:
             Country object if found, None otherwise
         """
-        sql = "SELECT * FROM countries WHERE code = %s"
-        result = query(sql, [code.upper()])
-        return Country.from_dict(result[0]) if result else None
+        row = _fetch_by_code(code.strip().upper(), _cache_version)
+        return Country.from_db_row(row) if row else None
 
     @staticmethod
     def update(country: Country) -> Country:
@@ -71,15 +140,8 @@ class CountryService:
             Updated country object
             
         Raises:
-            ValueError: If country doesn't exist or code is already in use
+            ValueError: If country doesn't exist or code/name is already in use
         """
-        if not CountryService.get_by_id(country.id):
-            raise ValueError(f"Country with id {country.id} not found")
-
-        existing = CountryService.get_by_code(country.code)
-        if existing and existing.id != country.id:
-            raise ValueError(f"Country code {country.code} is already in use")
-
         sql = """
             UPDATE countries 
             SET name = %s, code = %s
@@ -87,8 +149,18 @@ class CountryService:
             RETURNING *
         """
         params = [country.name, country.code, country.id]
-        result = query(sql, params, commit=True)
-        return Country.from_dict(result[0])
+        try:
+            result = query(sql, params, commit=True)
+        except errors.UniqueViolation as e:
+            if e.diag.constraint_name == 'countries_name_key':
+                raise ValueError(f"Country name {country.name} is already in use") from e
+            raise ValueError(f"Country code {country.code} is already in use") from e
+
+        if not result:
+            raise ValueError(f"Country with id {country.id} not found")
+        _invalidate_cache()
+        VacationService.clear_cache()  # Cached listings embed country name/code
+        return Country.from_db_row(result[0])
 
     @staticmethod
     def delete(country_id: int) -> bool:
@@ -104,15 +176,41 @@ class CountryService:
         Raises:
             ValueError: If country has associated vacations
         """
-        # Check for associated vacations
+        # Delete only if no vacations reference the country
+        sql = """
+            WITH v AS (
+                SELECT 1 FROM vacations WHERE country_id = %s LIMIT 1
+            )
+            DELETE FROM countries
+            WHERE id = %s AND NOT EXISTS (SELECT 1 FROM v)
+            RETURNING id
+        """
+        try:
+            result = query(sql, [country_id, country_id], commit=True)
+        except errors.ForeignKeyViolation as e:
+            # A vacation was added concurrently
+            raise ValueError("Cannot delete country with associated vacations") from e
+        if result:
+            _invalidate_cache()
+            return True
+
+        # Nothing deleted: disambiguate "has vacations" from "not found"
         check_sql = "SELECT EXISTS(SELECT 1 FROM vacations WHERE country_id = %s)"
         check_result = query(check_sql, [country_id])
         if check_result[0]['exists']:
             raise ValueError("Cannot delete country with associated vacations")
+        return False
 
-        sql = "DELETE FROM countries WHERE id = %s"
-        query(sql, [country_id], commit=True)
-        return True
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Drop all cached country lookups.
+
+        Call this after modifying the countries table outside CountryService.
+        """
+        _invalidate_cache()
+        _fetch_by_id.cache_clear()
+        _fetch_by_code.cache_clear()
 
     @staticmethod
     def get_all() -> List[Country]:
@@ -124,12 +222,31 @@ class CountryService:
         """
         sql = "SELECT * FROM countries ORDER BY name"
         result = query(sql)
-        return [Country.from_dict(row) for row in result]
+        return [Country.from_db_row(row) for row in result]
+
+    @staticmethod
+    def iter_all() -> Iterator[Country]:
+        """
+        Lazily iterate over all countries using a server-side cursor.
+
+        Holds a pooled connection until exhausted; close it when stopping early.
+
+        Yields:
+            Country instances, sorted by name
+        """
+        sql = "SELECT * FROM countries ORDER BY name"
+        # Close the stream with this generator, even when it is abandoned early
+        with closing(stream(sql, name='stream_countries')) as rows:
+            for row in rows:
+                yield Country.from_db_row(row)
 
     @staticmethod
     def search(term: str) -> List[Country]:
         """
-        Search countries by name or code.
+        Search countries by name substring or exact code.
+
+        The name match can use the pg_trgm index; codes are two letters, so
+        they are matched exactly against the unique code index.
         
         Args:
             term: Search term
@@ -139,12 +256,13 @@ class CountryService:
         """
         sql = """
             SELECT * FROM countries 
-            WHERE name ILIKE %s OR code ILIKE %s 
+            WHERE name ILIKE %s OR code = %s
             ORDER BY name
         """
+        term = term.strip()
         pattern = f"%{term}%"
-        result = query(sql, [pattern, pattern])
-        return [Country.from_dict(row) for row in result]
+        result = query(sql, [pattern, term.upper()])
+        return [Country.from_db_row(row) for row in result]
 
     @staticmethod
     def count() -> int:
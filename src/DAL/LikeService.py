@@ -1,10 +1,25 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
+from psycopg import errors
 from src.query import query
 from src.models.Like import Like
 from src.models.User import User
 from src.models.Vacation import Vacation
 
 
+# Vacation columns needed to build a Vacation
+_VACATION_LIST_COLUMNS = """
+    v.id,
+    v.country_id,
+    v.destination,
+    v.description,
+    v.start_date,
+    v.end_date,
+    v.price,
+    v.image_url,
+    v.created_at
+"""
+
+
 class LikeService:
     @staticmethod
     def create(like: Like) -> Like:
@@ -20,38 +35,129 @@ class LikeService:
         Raises:
             ValueError: If user or vacation doesn't exist, or if like already exists
         """
-        # Verify user exists
-        check_user_sql = "SELECT EXISTS(SELECT 1 FROM users WHERE id = %s)"
-        check_user_result = query(check_user_sql, [like.user_id])
-        if not check_user_result[0]['exists']:
-            raise ValueError(f"User with id {like.user_id} not found")
+        # Rely on the FK and unique constraints instead of pre-checking
+        sql = """
+            INSERT INTO likes (user_id, vacation_id)
+            VALUES (%s, %s)
+            ON CONFLICT (user_id, vacation_id) DO NOTHING
+            RETURNING *
+        """
+        params = [like.user_id, like.vacation_id]
+        try:
+            result = query(sql, params, commit=True)
+        except errors.ForeignKeyViolation as e:
+            if e.diag.constraint_name == 'likes_user_id_fkey':
+                raise ValueError(f"User with id {like.user_id} not found") from e
+            raise ValueError(f"Vacation with id {like.vacation_id} not found") from e
 
-        # Verify vacation exists
-        check_vacation_sql = "SELECT EXISTS(SELECT 1 FROM vacations WHERE id = %s)"
-        check_vacation_result = query(check_vacation_sql, [like.vacation_id])
-        if not check_vacation_result[0]['exists']:
-            raise ValueError(f"Vacation with id {like.vacation_id} not found")
+        if not result:
+            raise ValueError("User has already liked this vacation")
+        return Like.from_dict(result[0])
 
-        # Check if like already exists
-        check_like_sql = """
-            SELECT EXISTS(
-                SELECT 1 FROM likes 
-                WHERE user_id = %s AND vacation_id = %s
-            )
+    @staticmethod
+    def create_many(likes: List[Like]) -> List[Like]:
         """
-        check_like_result = query(check_like_sql, [like.user_id, like.vacation_id])
-        if check_like_result[0]['exists']:
-            raise ValueError("User has already liked this vacation")
+        Create many likes in a single statement.
+
+        Likes that already exist (or repeat within the batch) are skipped.
+
+        Args:
+            likes: Like objects to create
+
+        Returns:
+            The likes that were created, with IDs
+
+        Raises:
+            ValueError: If any referenced user or vacation doesn't exist
+        """
+        if not likes:
+            return []
 
-        # Create like
         sql = """
             INSERT INTO likes (user_id, vacation_id)
-            VALUES (%s, %s)
+            SELECT * FROM unnest(%s::int[], %s::int[])
+            ON CONFLICT (user_id, vacation_id) DO NOTHING
             RETURNING *
         """
-        params = [like.user_id, like.vacation_id]
-        result = query(sql, params, commit=True)
-        return Like.from_dict(result[0])
+        params = [
+            [like.user_id for like in likes],
+            [like.vacation_id for like in likes]
+        ]
+        try:
+            result = query(sql, params, commit=True)
+        except errors.ForeignKeyViolation as e:
+            if e.diag.constraint_name == 'likes_user_id_fkey':
+                raise ValueError("One or more users not found") from e
+            raise ValueError("One or more vacations not found") from e
+        return [Like.from_dict(row) for row in result]
+
+    @staticmethod
+    def try_create(user_id: int, vacation_id: int) -> Tuple[bool, Optional[Like]]:
+        """
+        Like a vacation, reporting a missing vacation or an existing like
+        from the same round trip as the insert.
+
+        Args:
+            user_id: ID of the user liking the vacation
+            vacation_id: ID of the vacation to like
+
+        Returns:
+            Tuple of (whether the vacation exists, created like or None if
+            the vacation is missing or was already liked)
+
+        Raises:
+            ValueError: If user doesn't exist
+        """
+        sql = """
+            WITH v AS (
+                SELECT id FROM vacations WHERE id = %s
+            ), inserted AS (
+                INSERT INTO likes (user_id, vacation_id)
+                SELECT %s, id FROM v
+                ON CONFLICT (user_id, vacation_id) DO NOTHING
+                RETURNING *
+            )
+            SELECT EXISTS(SELECT 1 FROM v) as vacation_exists, inserted.*
+            FROM (SELECT 1) one
+            LEFT JOIN inserted ON true
+        """
+        try:
+            result = query(sql, [vacation_id, user_id], commit=True)
+        except errors.ForeignKeyViolation as e:
+            if e.diag.constraint_name == 'likes_user_id_fkey':
+                raise ValueError(f"User with id {user_id} not found") from e
+            raise ValueError(f"Vacation with id {vacation_id} not found") from e
+
+        row = result[0]
+        like = Like.from_dict(row) if row['id'] is not None else None
+        return row['vacation_exists'], like
+
+    @staticmethod
+    def try_delete(user_id: int, vacation_id: int) -> Tuple[bool, bool]:
+        """
+        Remove a like, reporting a missing vacation from the same round trip.
+
+        Args:
+            user_id: ID of user who liked
+            vacation_id: ID of vacation that was liked
+
+        Returns:
+            Tuple of (whether the vacation exists, whether a like was deleted)
+        """
+        sql = """
+            WITH v AS (
+                SELECT id FROM vacations WHERE id = %s
+            ), deleted AS (
+                DELETE FROM likes
+                WHERE user_id = %s AND vacation_id IN (SELECT id FROM v)
+                RETURNING id
+            )
+            SELECT
+                EXISTS(SELECT 1 FROM v) as vacation_exists,
+                EXISTS(SELECT 1 FROM deleted) as deleted
+        """
+        result = query(sql, [vacation_id, user_id], commit=True)
+        return result[0]['vacation_exists'], result[0]['deleted']
 
     @staticmethod
     def delete(user_id: int, vacation_id: int) -> bool:
@@ -82,20 +188,17 @@ class LikeService:
             user_id: User ID
             
         Returns:
-            List of vacations with like information
+            List of vacations with like information, including each
+            vacation's total like_count
         """
-        sql = """
+        sql = f"""
             SELECT 
-                v.*,
-                c.id as c_id,
-                c.name as c_name,
-                c.code as c_code,
-                c.created_at as c_created_at,
+                {_VACATION_LIST_COLUMNS},
                 l.id as like_id,
-                l.created_at as like_created_at
+                l.created_at as like_created_at,
+                (SELECT COUNT(*) FROM likes WHERE vacation_id = v.id) as like_count
             FROM likes l
             JOIN vacations v ON l.vacation_id = v.id
-            JOIN countries c ON v.country_id = c.id
             WHERE l.user_id = %s
             ORDER BY l.created_at DESC
         """
@@ -138,7 +241,7 @@ class LikeService:
             Number of likes
         """
         sql = "SELECT COUNT(*) as count FROM likes WHERE vacation_id = %s"
-        result = query(sql, [vacation_id])
+        result = query(sql, [vacation_id], prepare=True)
         return result[0]['count']
 
     @staticmethod
@@ -159,7 +262,7 @@ class LikeService:
                 WHERE user_id = %s AND vacation_id = %s
             ) as exists
         """
-        result = query(sql, [user_id, vacation_id])
+        result = query(sql, [user_id, vacation_id], prepare=True)
         return result[0]['exists']
 
     @staticmethod
@@ -173,18 +276,17 @@ class LikeService:
         Returns:
             List of vacations with like counts
         """
-        sql = """
+        # Aggregate likes on their own so the count can use likes(vacation_id)
+        sql = f"""
             SELECT 
-                v.*,
-                c.id as c_id,
-                c.name as c_name,
-                c.code as c_code,
-                c.created_at as c_created_at,
-                COUNT(l.id) as like_count
+                {_VACATION_LIST_COLUMNS},
+                COALESCE(l.like_count, 0) as like_count
             FROM vacations v
-            JOIN countries c ON v.country_id = c.id
-            LEFT JOIN likes l ON v.id = l.vacation_id
-            GROUP BY v.id, c.id
+            LEFT JOIN (
+                SELECT vacation_id, COUNT(*) as like_count
+                FROM likes
+                GROUP BY vacation_id
+            ) l ON v.id = l.vacation_id
             ORDER BY like_count DESC
             LIMIT %s
         """
@@ -1,9 +1,11 @@
 """
 User service that handles user data operations.
 """
-from typing import Optional, List
+from contextlib import closing
+from typing import Iterator, Optional, List
+from psycopg import errors
 from src.models.User import User
-from src.query import query
+from src.query import query, stream
 
 
 class UserService:
@@ -21,11 +23,7 @@ class UserService:
         Raises:
             ValueError: If user with email already exists
         """
-        # Check if email exists
-        if UserService.get_by_email(user.email):
-            raise ValueError("Email already exists")
-        
-        # Insert user
+        # Insert user; the unique index on lower(email) rejects duplicates (any case)
         sql = """
         INSERT INTO users (first_name, last_name, email, password, role_id)
         VALUES (%s, %s, %s, %s, %s)
@@ -38,9 +36,48 @@ class UserService:
             user.password_hash,  # We store the hash in the password column
             user.role_id
         ]
-        result = query(sql, params, commit=True)
+        try:
+            result = query(sql, params, commit=True)
+        except errors.UniqueViolation as e:
+            raise ValueError("Email already exists") from e
         return User.from_db_row(result[0])
 
+    @staticmethod
+    def create_many(users: List[User]) -> List[User]:
+        """
+        Create many users in a single statement.
+
+        Args:
+            users: User instances to create
+
+        Returns:
+            Created user instances
+
+        Raises:
+            ValueError: If any email already exists; no user is created in
+                that case
+        """
+        if not users:
+            return []
+
+        sql = """
+        INSERT INTO users (first_name, last_name, email, password, role_id)
+        SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::role_enum[])
+        RETURNING id, first_name, last_name, email, password, role_id, created_at
+        """
+        params = [
+            [user.first_name for user in users],
+            [user.last_name for user in users],
+            [user.email for user in users],
+            [user.password_hash for user in users],
+            [user.role_id for user in users]
+        ]
+        try:
+            result = query(sql, params, commit=True)
+        except errors.UniqueViolation as e:
+            raise ValueError("Email already exists") from e
+        return [User.from_db_row(row) for row in result]
+
     @staticmethod
     def get_by_id(user_id: int) -> Optional[User]:
         """
@@ -57,13 +94,13 @@ class UserService:
         FROM users
         WHERE id = %s
         """
-        result = query(sql, [user_id])
+        result = query(sql, [user_id], prepare=True)
         return User.from_db_row(result[0]) if result else None
 
     @staticmethod
     def get_by_email(email: str) -> Optional[User]:
         """
-        Get a user by email.
+        Get a user by email, ignoring case.
         
         Args:
             email: User email
@@ -74,9 +111,9 @@ class UserService:
         sql = """
         SELECT id, first_name, last_name, email, password, role_id, created_at
         FROM users
-        WHERE email = %s
+        WHERE lower(email) = %s
         """
-        result = query(sql, [email])
+        result = query(sql, [email.lower()], prepare=True)
         return User.from_db_row(result[0]) if result else None
 
     @staticmethod
@@ -91,7 +128,7 @@ class UserService:
             Updated user instance
             
         Raises:
-            ValueError: If user not found
+            ValueError: If user not found or email is already in use
         """
         sql = """
         UPDATE users
@@ -109,9 +146,14 @@ class UserService:
             user.role_id,
             user.id
         ]
-        result = query(sql, params, commit=True)
+        try:
+            result = query(sql, params, commit=True)
+        except errors.UniqueViolation as e:
+            raise ValueError("Email already exists") from e
         if not result:
             raise ValueError("User not found")
+        # Tokens verified against the old email or role must be re-checked
+        UserService._invalidate_tokens(user.id)
         return User.from_db_row(result[0])
 
     @staticmethod
@@ -129,19 +171,16 @@ class UserService:
         Raises:
             ValueError: If user not found
         """
-        # Get user to generate new password hash
-        user = UserService.get_by_id(user_id)
-        if not user:
-            raise ValueError("User not found")
-        
-        # Update password hash
-        user.set_password(new_password)
         sql = """
         UPDATE users
         SET password = %s
         WHERE id = %s
+        RETURNING id
         """
-        query(sql, [user.password_hash, user_id], commit=True)
+        password_hash = User.hash_password(new_password)
+        result = query(sql, [password_hash, user_id], commit=True)
+        if not result:
+            raise ValueError("User not found")
         return True
 
     @staticmethod
@@ -157,6 +196,7 @@ class UserService:
         """
         sql = "DELETE FROM users WHERE id = %s"
         query(sql, [user_id], commit=True)
+        UserService._invalidate_tokens(user_id)
         return True
 
     @staticmethod
@@ -175,10 +215,30 @@ class UserService:
         result = query(sql)
         return [User.from_db_row(row) for row in result]
 
+    @staticmethod
+    def iter_all() -> Iterator[User]:
+        """
+        Lazily iterate over all users using a server-side cursor.
+
+        Holds a pooled connection until exhausted; close it when stopping early.
+
+        Yields:
+            User instances, newest first
+        """
+        sql = """
+        SELECT id, first_name, last_name, email, password, role_id, created_at
+        FROM users
+        ORDER BY created_at DESC
+        """
+        # Close the stream with this generator, even when it is abandoned early
+        with closing(stream(sql, name='stream_users')) as rows:
+            for row in rows:
+                yield User.from_db_row(row)
+
     @staticmethod
     def exists(email: str) -> bool:
         """
-        Check if a user with the given email exists.
+        Check if a user with the given email exists, ignoring case.
         
         Args:
             email: Email to check
@@ -186,8 +246,8 @@ class UserService:
         Returns:
             True if user exists
         """
-        sql = "SELECT EXISTS(SELECT 1 FROM users WHERE email = %s)"
-        result = query(sql, [email])
+        sql = "SELECT EXISTS(SELECT 1 FROM users WHERE lower(email) = %s)"
+        result = query(sql, [email.lower()])
         return result[0]['exists']
 
     @staticmethod
@@ -202,6 +262,13 @@ class UserService:
         result = query(sql)
         return result[0]['count']
 
+    @staticmethod
+    def _invalidate_tokens(user_id: int) -> None:
+        """Drop the user's cached verified tokens held by AuthService."""
+        # Imported here since AuthService imports this module
+        from src.DAL.AuthService import AuthService
+        AuthService.invalidate_user_tokens(user_id)
+
     @staticmethod
     def _execute_query(sql: str, params: list = None) -> None:
         """Execute a raw SQL query. For testing purposes only."""
@@ -1,10 +1,65 @@
-from typing import List, Optional, Dict
-from datetime import date
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime
 from decimal import Decimal
-from src.query import query
+from psycopg import errors
+from src.query import query, stream
 from src.models.Vacation import Vacation
 from src.models.Country import Country
 
+# Read cache: lookup key -> (result, expiry as a unix timestamp). Holds
+# get_all/count results and get_by_id rows. Writes through VacationService
+# clear it; the TTL bounds staleness from writes made elsewhere (other
+# processes, raw SQL).
+_CACHE_MAX_SIZE = 512
+_CACHE_TTL_SECONDS = 60
+_cache: Dict[Tuple, Tuple[Any, float]] = {}
+_cache_lock = threading.Lock()
+# Bumped on every invalidation; a reader that started its query under an
+# older version must not put its (possibly pre-write) result back
+_cache_version = 0
+
+
+def _cache_get(key: Tuple) -> Optional[Any]:
+    """Return a cached result, or None if missing or expired."""
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del _cache[key]
+            return None
+        return entry[0]
+
+
+def _cache_put(key: Tuple, value: Any, version: int) -> None:
+    """
+    Cache a result, evicting the oldest entry when full.
+    
+    Args:
+        key: Lookup key
+        value: Result to cache
+        version: _cache_version read before the result was queried; the put
+            is skipped if the cache was invalidated since
+    """
+    with _cache_lock:
+        if version != _cache_version:
+            return
+        if key not in _cache and len(_cache) >= _CACHE_MAX_SIZE:
+            del _cache[next(iter(_cache))]
+        _cache[key] = (value, time.time() + _CACHE_TTL_SECONDS)
+
+
+def _invalidate_cache():
+    """Drop all cached lookups, listings and counts."""
+    global _cache_version
+    with _cache_lock:
+        _cache_version += 1
+        _cache.clear()
+
+
 class VacationService:
     @staticmethod
     def create(vacation: Vacation) -> Vacation:
@@ -20,12 +75,7 @@ class VacationService:
         Raises:
             ValueError: If country doesn't exist
         """
-        # Verify country exists
-        check_sql = "SELECT EXISTS(SELECT 1 FROM countries WHERE id = %s)"
-        check_result = query(check_sql, [vacation.country_id])
-        if not check_result[0]['exists']:
-            raise ValueError(f"Country with id {vacation.country_id} not found")
-
+        # The country_id FK rejects unknown countries
         sql = """
             WITH inserted AS (
                 INSERT INTO vacations (
@@ -52,20 +102,35 @@ class VacationService:
             vacation.price,
             vacation.image_url
         ]
-        result = query(sql, params, commit=True)
+        try:
+            result = query(sql, params, commit=True)
+        except errors.ForeignKeyViolation as e:
+            raise ValueError(f"Country with id {vacation.country_id} not found") from e
+        _invalidate_cache()
         return VacationService._load_with_country(result[0])
 
     @staticmethod
-    def get_by_id(vacation_id: int) -> Optional[Vacation]:
+    def get_by_id(vacation_id: int, use_cache: bool = True) -> Optional[Vacation]:
         """
         Get vacation by ID.
         
         Args:
             vacation_id: Vacation ID
+            use_cache: Serve from and fill the read cache; pass False when the
+                result will be modified and written back, since a cached row
+                can be up to _CACHE_TTL_SECONDS stale
             
         Returns:
             Vacation object if found, None otherwise
         """
+        # Cache the row, not the object: callers may mutate what they get
+        key = ('get_by_id', vacation_id)
+        if use_cache:
+            row = _cache_get(key)
+            if row is not None:
+                return VacationService._load_with_country(row)
+        version = _cache_version
+
         sql = """
             SELECT 
                 v.*,
@@ -78,7 +143,47 @@ class VacationService:
             WHERE v.id = %s
         """
         result = query(sql, [vacation_id])
-        return VacationService._load_with_country(result[0]) if result else None
+        if not result:
+            return None
+        if use_cache:
+            _cache_put(key, result[0], version)
+        return VacationService._load_with_country(result[0])
+
+    @staticmethod
+    def get_with_like_info(
+        vacation_id: int,
+        user_id: int
+    ) -> Optional[Tuple[Vacation, int, bool]]:
+        """
+        Get a vacation with its like count and the user's like status in one query.
+
+        Args:
+            vacation_id: Vacation ID
+            user_id: User whose like status to report
+
+        Returns:
+            Tuple of (vacation, likes count, liked by user) if found, None otherwise
+        """
+        sql = """
+            SELECT
+                v.*,
+                c.id as c_id,
+                c.name as c_name,
+                c.code as c_code,
+                c.created_at as c_created_at,
+                (SELECT COUNT(*) FROM likes WHERE vacation_id = v.id) as like_count,
+                EXISTS(
+                    SELECT 1 FROM likes WHERE vacation_id = v.id AND user_id = %s
+                ) as is_liked
+            FROM vacations v
+            JOIN countries c ON v.country_id = c.id
+            WHERE v.id = %s
+        """
+        result = query(sql, [user_id, vacation_id])
+        if not result:
+            return None
+        row = result[0]
+        return VacationService._load_with_country(row), row['like_count'], row['is_liked']
 
     @staticmethod
     def update(vacation: Vacation) -> Vacation:
@@ -94,15 +199,7 @@ class VacationService:
         Raises:
             ValueError: If vacation doesn't exist or country doesn't exist
         """
-        if not VacationService.get_by_id(vacation.id):
-            raise ValueError(f"Vacation with id {vacation.id} not found")
-
-        # Verify country exists
-        check_sql = "SELECT EXISTS(SELECT 1 FROM countries WHERE id = %s)"
-        check_result = query(check_sql, [vacation.country_id])
-        if not check_result[0]['exists']:
-            raise ValueError(f"Country with id {vacation.country_id} not found")
-
+        # An empty result means no such vacation; the FK rejects unknown countries
         sql = """
             WITH updated AS (
                 UPDATE vacations 
@@ -135,7 +232,14 @@ class VacationService:
             vacation.image_url,
             vacation.id
         ]
-        result = query(sql, params, commit=True)
+        try:
+            result = query(sql, params, commit=True)
+        except errors.ForeignKeyViolation as e:
+            raise ValueError(f"Country with id {vacation.country_id} not found") from e
+
+        if not result:
+            raise ValueError(f"Vacation with id {vacation.id} not found")
+        _invalidate_cache()
         return VacationService._load_with_country(result[0])
 
     @staticmethod
@@ -147,20 +251,33 @@ class VacationService:
             vacation_id: ID of vacation to delete
             
         Returns:
-            True if vacation was deleted
+            True if vacation was deleted, False if it doesn't exist
             
         Raises:
             ValueError: If vacation has associated likes
         """
-        # Check for associated likes
+        # Delete only if no likes reference the vacation
+        sql = """
+            DELETE FROM vacations
+            WHERE id = %s
+                AND NOT EXISTS (SELECT 1 FROM likes WHERE vacation_id = %s)
+            RETURNING id
+        """
+        try:
+            result = query(sql, [vacation_id, vacation_id], commit=True)
+        except errors.ForeignKeyViolation as e:
+            # A like was added concurrently
+            raise ValueError("Cannot delete vacation with associated likes") from e
+        if result:
+            _invalidate_cache()
+            return True
+
+        # Nothing deleted: disambiguate "has likes" from "not found"
         check_sql = "SELECT EXISTS(SELECT 1 FROM likes WHERE vacation_id = %s)"
         check_result = query(check_sql, [vacation_id])
         if check_result[0]['exists']:
             raise ValueError("Cannot delete vacation with associated likes")
-
-        sql = "DELETE FROM vacations WHERE id = %s"
-        query(sql, [vacation_id], commit=True)
-        return True
+        return False
 
     @staticmethod
     def get_all(
@@ -187,6 +304,14 @@ class VacationService:
         Returns:
             List of vacations matching criteria
         """
+        # Cache the rows, not the objects: callers may mutate what they get
+        key = ('get_all', country_id, min_price, max_price, start_date, end_date,
+               sort_by, sort_order)
+        rows = _cache_get(key)
+        if rows is not None:
+            return [VacationService._load_with_country(row) for row in rows]
+        version = _cache_version
+
         sql = """
             SELECT 
                 v.*,
@@ -198,27 +323,10 @@ class VacationService:
             JOIN countries c ON v.country_id = c.id
             WHERE 1=1
         """
-        params = []
-
-        if country_id:
-            sql += " AND v.country_id = %s"
-            params.append(country_id)
-
-        if min_price:
-            sql += " AND v.price >= %s"
-            params.append(min_price)
-
-        if max_price:
-            sql += " AND v.price <= %s"
-            params.append(max_price)
-
-        if start_date:
-            sql += " AND v.start_date >= %s"
-            params.append(start_date)
-
-        if end_date:
-            sql += " AND v.end_date <= %s"
-            params.append(end_date)
+        filters, params = VacationService._build_filters(
+            country_id, min_price, max_price, start_date, end_date
+        )
+        sql += filters
 
         # Validate and apply sorting
         valid_sort_fields = {'start_date', 'end_date', 'price', 'destination'}
@@ -232,8 +340,37 @@ class VacationService:
         sql += f" ORDER BY v.{sort_by} {sort_order}"
         
         result = query(sql, params)
+        _cache_put(key, result, version)
         return [VacationService._load_with_country(row) for row in result]
 
+    @staticmethod
+    def iter_all() -> Iterator[Vacation]:
+        """
+        Lazily iterate over all vacations using a server-side cursor.
+
+        Unlike get_all, rows are fetched in batches and never held in memory
+        all at once, and nothing is cached. Holds a pooled connection until
+        exhausted; close it when stopping early.
+
+        Yields:
+            Vacation instances with country data, sorted by start date
+        """
+        sql = """
+            SELECT
+                v.*,
+                c.id as c_id,
+                c.name as c_name,
+                c.code as c_code,
+                c.created_at as c_created_at
+            FROM vacations v
+            JOIN countries c ON v.country_id = c.id
+            ORDER BY v.start_date
+        """
+        # Close the stream with this generator, even when it is abandoned early
+        with closing(stream(sql, itersize=500, name='stream_vacations')) as rows:
+            for row in rows:
+                yield VacationService._load_with_country(row)
+
     @staticmethod
     def search(term: str) -> List[Vacation]:
         """
@@ -254,25 +391,112 @@ class VacationService:
                 c.created_at as c_created_at
             FROM vacations v
             JOIN countries c ON v.country_id = c.id
-            WHERE v.destination ILIKE %s 
-                OR v.description ILIKE %s
+            WHERE (v.destination || E'\\n' || coalesce(v.description, '')) ILIKE %s
             ORDER BY v.start_date
         """
         pattern = f"%{term}%"
-        result = query(sql, [pattern, pattern])
+        result = query(sql, [pattern])
         return [VacationService._load_with_country(row) for row in result]
 
     @staticmethod
-    def count(country_id: Optional[int] = None) -> int:
+    def search_filtered(
+        term: Optional[str] = None,
+        country_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        user_id: Optional[int] = None
+    ) -> List[Tuple[Vacation, int, bool]]:
+        """
+        Search vacations with all filters applied in a single query.
+
+        Args:
+            term: Optional text to match in destination or description
+            country_id: Filter by country ID
+            min_price: Filter by minimum price
+            max_price: Filter by maximum price
+            start_date: Filter by start date
+            end_date: Filter by end date
+            user_id: Optional user ID to compute like information for
+
+        Returns:
+            List of (vacation, likes count, liked by user) tuples sorted by
+            start date; the like fields are 0 and False when no user_id is given
+        """
+        params = []
+        if user_id:
+            like_columns = """,
+                (SELECT COUNT(*) FROM likes WHERE vacation_id = v.id) as like_count,
+                EXISTS(
+                    SELECT 1 FROM likes WHERE vacation_id = v.id AND user_id = %s
+                ) as is_liked"""
+            params.append(user_id)
+        else:
+            like_columns = ""
+
+        sql = f"""
+            SELECT
+                v.*,
+                c.id as c_id,
+                c.name as c_name,
+                c.code as c_code,
+                c.created_at as c_created_at{like_columns}
+            FROM vacations v
+            JOIN countries c ON v.country_id = c.id
+            WHERE 1=1
+        """
+        if term:
+            sql += " AND (v.destination || E'\\n' || coalesce(v.description, '')) ILIKE %s"
+            params.append(f"%{term}%")
+
+        filters, filter_params = VacationService._build_filters(
+            country_id, min_price, max_price, start_date, end_date
+        )
+        sql += filters + " ORDER BY v.start_date"
+        params.extend(filter_params)
+
+        result = query(sql, params)
+        return [
+            (
+                VacationService._load_with_country(row),
+                row.get('like_count', 0),
+                row.get('is_liked', False)
+            )
+            for row in result
+        ]
+
+    @staticmethod
+    def count(country_id: Optional[int] = None, estimate: bool = False) -> int:
         """
         Get total number of vacations.
         
         Args:
             country_id: Optional country ID to filter by
+            estimate: Return the planner's row estimate instead of an exact
+                count when no filter is given. Much cheaper on large tables,
+                but only as fresh as the last VACUUM/ANALYZE.
             
         Returns:
             Total number of vacations
         """
+        if estimate and not country_id:
+            sql = """
+                SELECT reltuples::BIGINT as count
+                FROM pg_class
+                WHERE oid = 'vacations'::regclass
+            """
+            result = query(sql)
+            # reltuples is -1 until the table has been analyzed
+            if result[0]['count'] >= 0:
+                return result[0]['count']
+
+        key = ('count', country_id)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+        version = _cache_version
+
         sql = "SELECT COUNT(*) as count FROM vacations"
         params = []
         
@@ -281,8 +505,57 @@ class VacationService:
             params.append(country_id)
             
         result = query(sql, params)
+        _cache_put(key, result[0]['count'], version)
         return result[0]['count']
 
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Drop all cached vacation lookups, listings and counts.
+
+        Call this after modifying the vacations table outside VacationService.
+        """
+        _invalidate_cache()
+
+    @staticmethod
+    def _build_filters(
+        country_id: Optional[int],
+        min_price: Optional[Decimal],
+        max_price: Optional[Decimal],
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Tuple[str, List]:
+        """
+        Build the WHERE conditions shared by the listing queries.
+
+        Returns:
+            Tuple of (SQL fragment of " AND ..." conditions, parameters)
+        """
+        sql = ""
+        params = []
+
+        if country_id:
+            sql += " AND v.country_id = %s"
+            params.append(country_id)
+
+        if min_price:
+            sql += " AND v.price >= %s"
+            params.append(min_price)
+
+        if max_price:
+            sql += " AND v.price <= %s"
+            params.append(max_price)
+
+        if start_date:
+            sql += " AND v.start_date >= %s"
+            params.append(start_date)
+
+        if end_date:
+            sql += " AND v.end_date <= %s"
+            params.append(end_date)
+
+        return sql, params
+
     @staticmethod
     def _load_with_country(row: Dict) -> Vacation:
         """
@@ -294,26 +567,10 @@ class VacationService:
         Returns:
             Vacation instance with associated Country
         """
-        # Extract country data
-        country = Country(
-            id=row['c_id'],
-            name=row['c_name'],
-            code=row['c_code'],
-            created_at=row['c_created_at']
-        )
-        
-        # Create vacation data dictionary
-        vacation_data = {
-            'id': row['id'],
-            'country_id': row['country_id'],
-            'destination': row['destination'],
-            'description': row['description'],
-            'start_date': row['start_date'],
-            'end_date': row['end_date'],
-            'price': row['price'],
-            'image_url': row['image_url'],
-            'created_at': row['created_at'],
-            'country': country.to_dict()
-        }
-        
-        return Vacation.from_dict(vacation_data) 
\ No newline at end of file
+        # Rows are trusted, so skip the dict round trip and model validation
+        country = Country.__new__(Country)
+        country.id = row['c_id']
+        country.name = row['c_name']
+        country.code = row['c_code']
+        country.created_at = row['c_created_at'] or datetime.now()
+        return Vacation.from_db_row(row, country)
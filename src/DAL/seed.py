@@ -1,12 +1,15 @@
 """
 Database seeding module that executes schema.sql only if tables don't exist or are empty.
 """
+import logging
 from src.query import query
 
+logger = logging.getLogger(__name__)
+
 
 def check_tables_exist():
     """Check if all required tables exist and have data."""
-    print("Checking existing tables...")
+    logger.info("Checking existing tables...")
     
     # Check if tables exist
     tables = query("""
@@ -20,41 +23,45 @@ def check_tables_exist():
     
     if not expected_tables.issubset(found_tables):
         missing_tables = expected_tables - found_tables
-        print(f"Missing tables: {', '.join(missing_tables)}")
+        logger.warning("Missing tables: %s", ', '.join(sorted(missing_tables)))
         return False
     
-    # Check if tables have data
-    for table in expected_tables:
-        count = query(f"SELECT COUNT(*) as count FROM {table}")[0]['count']
-        if count == 0:
-            print(f"Table {table} exists but is empty")
+    # Check if tables have data (one round trip for all tables)
+    rows = query(" UNION ALL ".join(
+        f"SELECT '{table}' AS table_name, EXISTS(SELECT 1 FROM {table}) AS has_data"
+        for table in sorted(expected_tables)
+    ))
+    for row in rows:
+        if not row['has_data']:
+            logger.info("Table %s exists but is empty", row['table_name'])
             return False
     
-    print("All tables exist and contain data")
+    logger.info("All tables exist and contain data")
     return True
 
 
 def seed_database():
     """Execute schema.sql to create and populate the database."""
-    print("Starting database check...")
+    logger.info("Starting database check...")
     
     # Check if tables exist and have data
     if check_tables_exist():
-        print("Database is already seeded. Skipping...")
+        logger.info("Database is already seeded. Skipping...")
         return
     
     # If we get here, we need to create/seed the tables
-    print("Executing schema.sql...")
+    logger.info("Executing schema.sql...")
     with open('SQL/schema.sql', 'r') as f:
         schema_sql = f.read()
         query(schema_sql, commit=True)
     
     # Verify the seeding worked
     if check_tables_exist():
-        print("Database seeded successfully!")
+        logger.info("Database seeded successfully!")
     else:
-        print("Warning: Database seeding may have failed. Please check the tables.")
+        logger.warning("Database seeding may have failed. Please check the tables.")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     seed_database()
\ No newline at end of file
@@ -4,20 +4,17 @@ Handles loading of environment variables for different environments.
 """
 import os
 from collections import namedtuple
-from dotenv import load_dotenv
+from functools import lru_cache
+from dotenv import dotenv_values, load_dotenv
 
 
 # Simple named tuple for database configuration
 DBConfig = namedtuple('DBConfig', ['user', 'password', 'host', 'port', 'database'])
 
 
-def get_config():
-    """
-    Get application configuration.
-    
-    Returns:
-        Dictionary containing application configuration
-    """
+@lru_cache(maxsize=1)
+def _load_config():
+    """Load the application configuration once per process."""
     # Load environment variables
     load_dotenv()
     
@@ -32,6 +29,25 @@ def get_config():
     }
 
 
+def get_config():
+    """
+    Get application configuration.
+
+    The .env file and environment are read on the first call only.
+
+    Returns:
+        Dictionary containing application configuration
+    """
+    return dict(_load_config())
+
+
+@lru_cache(maxsize=4)
+def _read_env_file(env_file):
+    """Parse an environment file once and return its variables."""
+    return {key: value for key, value in dotenv_values(env_file).items()
+            if value is not None}
+
+
 def get_connection_string(config):
     """
     Generate a PostgreSQL connection string.
@@ -57,8 +73,8 @@ def load_db_config(env_file=None):
     """
     # Load environment variables from file if specified
     if env_file:
-        # Override existing variables
-        load_dotenv(env_file, override=True)
+        # Override existing variables; the file itself is only parsed once
+        os.environ.update(_read_env_file(env_file))
     
     return DBConfig(
         user=os.getenv('POSTGRES_USER', 'db_admin'),
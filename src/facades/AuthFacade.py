@@ -41,7 +41,8 @@ class AuthFacade:
             email=email,
             password=password
         )
-        _, token = AuthService.login(email, password)
+        # The password was just set, so mint the token without re-verifying it
+        token = AuthService.generate_token(user)
         return user.to_dict(), token
 
     def login(self, email: str, password: str) -> Tuple[Dict, str]:
@@ -3,7 +3,7 @@ VacationFacade provides a high-level interface for managing vacations and their
 This includes vacation CRUD operations and like/unlike functionality.
 """
 from typing import List, Dict, Optional, Tuple
-from datetime import date, datetime
+from datetime import date
 from decimal import Decimal
 
 from src.models.Vacation import Vacation
@@ -30,24 +30,20 @@ class VacationFacade:
         Returns:
             Dictionary with properly formatted fields
         """
-        vacation_dict = vacation.to_dict()
-        
-        # Convert string dates to date objects if they're strings
-        if isinstance(vacation_dict['start_date'], str):
-            vacation_dict['start_date'] = datetime.strptime(
-                vacation_dict['start_date'], '%Y-%m-%d'
-            ).date()
-            
-        if isinstance(vacation_dict['end_date'], str):
-            vacation_dict['end_date'] = datetime.strptime(
-                vacation_dict['end_date'], '%Y-%m-%d'
-            ).date()
-            
-        # Convert price to Decimal if it's a string
-        if isinstance(vacation_dict['price'], str):
-            vacation_dict['price'] = Decimal(vacation_dict['price'])
-            
-        return vacation_dict
+        # Built directly rather than via to_dict(), which would stringify the
+        # dates and price only for them to be converted back
+        return {
+            'id': vacation.id,
+            'country_id': vacation.country_id,
+            'destination': vacation.destination,
+            'description': vacation.description,
+            'start_date': vacation.start_date,
+            'end_date': vacation.end_date,
+            'price': vacation.price,
+            'image_url': vacation.image_url,
+            'created_at': vacation.created_at.isoformat() if vacation.created_at else None,
+            'country': vacation.country.to_dict() if vacation.country else None
+        }
 
     def create_vacation(self, country_code: str, destination: str, description: str,
                        start_date: date, end_date: date, price: Decimal,
@@ -107,17 +103,20 @@ class VacationFacade:
         Raises:
             ValueError: If vacation not found
         """
-        vacation = self.vacation_service.get_by_id(vacation_id)
-        if not vacation:
+        if not user_id:
+            vacation = self.vacation_service.get_by_id(vacation_id)
+            if not vacation:
+                raise ValueError(f"Vacation not found: {vacation_id}")
+            return self._format_vacation_dict(vacation)
+
+        found = self.vacation_service.get_with_like_info(vacation_id, user_id)
+        if not found:
             raise ValueError(f"Vacation not found: {vacation_id}")
 
+        vacation, likes_count, is_liked = found
         result = self._format_vacation_dict(vacation)
-        
-        # Add like information if user_id provided
-        if user_id:
-            result['is_liked'] = self.like_service.has_user_liked(user_id, vacation_id)
-            result['likes_count'] = self.like_service.count_by_vacation(vacation_id)
-
+        result['is_liked'] = is_liked
+        result['likes_count'] = likes_count
         return result
 
     def update_vacation(self, vacation_id: int, **kwargs) -> Dict:
@@ -135,8 +134,8 @@ class VacationFacade:
         Raises:
             ValueError: If vacation not found or update data invalid
         """
-        # Get existing vacation
-        vacation = self.vacation_service.get_by_id(vacation_id)
+        # Get existing vacation, uncached since its fields are written back
+        vacation = self.vacation_service.get_by_id(vacation_id, use_cache=False)
         if not vacation:
             raise ValueError(f"Vacation not found: {vacation_id}")
 
@@ -177,7 +176,7 @@ class VacationFacade:
         Raises:
             ValueError: If vacation not found
         """
-        if not self.vacation_service.get_by_id(vacation_id):
+        if not self.vacation_service.get_by_id(vacation_id, use_cache=False):
             raise ValueError(f"Vacation not found: {vacation_id}")
 
         return self.vacation_service.delete(vacation_id)
@@ -196,17 +195,12 @@ class VacationFacade:
         Raises:
             ValueError: If vacation not found or already liked
         """
-        # Verify vacation exists
-        if not self.vacation_service.get_by_id(vacation_id):
+        # Existence and duplicate checks happen in the insert's round trip
+        vacation_exists, created_like = self.like_service.try_create(user_id, vacation_id)
+        if not vacation_exists:
             raise ValueError(f"Vacation not found: {vacation_id}")
-
-        # Check if already liked
-        if self.like_service.has_user_liked(user_id, vacation_id):
+        if created_like is None:
             raise ValueError(f"User {user_id} has already liked vacation {vacation_id}")
-
-        # Create like
-        like = Like(user_id=user_id, vacation_id=vacation_id)
-        created_like = self.like_service.create(like)
         
         return {
             'id': created_like.id,
@@ -215,6 +209,32 @@ class VacationFacade:
             'created_at': created_like.created_at
         }
 
+    def bulk_like(self, user_id: int, vacation_ids: List[int]) -> List[Dict]:
+        """
+        Like many vacations for a user at once, e.g. for imports.
+
+        Args:
+            user_id: ID of the user
+            vacation_ids: IDs of the vacations to like
+
+        Returns:
+            List of like dictionaries for the newly created likes; vacations
+            the user already liked are skipped
+
+        Raises:
+            ValueError: If the user or any vacation doesn't exist
+        """
+        likes = [Like(user_id=user_id, vacation_id=vacation_id) for vacation_id in vacation_ids]
+        return [
+            {
+                'id': like.id,
+                'user_id': like.user_id,
+                'vacation_id': like.vacation_id,
+                'created_at': like.created_at
+            }
+            for like in self.like_service.create_many(likes)
+        ]
+
     def unlike_vacation(self, user_id: int, vacation_id: int) -> bool:
         """
         Remove a like from a vacation for a user.
@@ -229,16 +249,13 @@ class VacationFacade:
         Raises:
             ValueError: If vacation not found or not liked
         """
-        # Verify vacation exists
-        if not self.vacation_service.get_by_id(vacation_id):
+        # Existence and liked checks happen in the delete's round trip
+        vacation_exists, deleted = self.like_service.try_delete(user_id, vacation_id)
+        if not vacation_exists:
             raise ValueError(f"Vacation not found: {vacation_id}")
-
-        # Check if liked
-        if not self.like_service.has_user_liked(user_id, vacation_id):
+        if not deleted:
             raise ValueError(f"User {user_id} has not liked vacation {vacation_id}")
-
-        # Delete like
-        return self.like_service.delete(user_id, vacation_id)
+        return True
 
     def get_user_liked_vacations(self, user_id: int) -> List[Dict]:
         """
@@ -254,10 +271,10 @@ class VacationFacade:
         result = []
         
         for vacation_data in liked_vacations:
-            vacation = Vacation.from_dict(vacation_data)
+            vacation = Vacation.from_db_row(vacation_data)
             vacation_dict = self._format_vacation_dict(vacation)
             vacation_dict['is_liked'] = True
-            vacation_dict['likes_count'] = self.like_service.count_by_vacation(vacation.id)
+            vacation_dict['likes_count'] = vacation_data['like_count']
             result.append(vacation_dict)
 
         return result
@@ -276,7 +293,7 @@ class VacationFacade:
         result = []
         
         for vacation_data in popular_vacations:
-            vacation = Vacation.from_dict(vacation_data)
+            vacation = Vacation.from_db_row(vacation_data)
             vacation_dict = self._format_vacation_dict(vacation)
             vacation_dict['likes_count'] = vacation_data['like_count']
             result.append(vacation_dict)
@@ -310,40 +327,23 @@ class VacationFacade:
                 raise ValueError(f"Invalid country code: {country_code}")
             country_id = country.id
 
-        # Get initial vacation list based on search term
-        if query:
-            vacations = self.vacation_service.search(query)
-        else:
-            vacations = self.vacation_service.get_all()
-
-        # Apply filters
-        filtered_vacations = []
-        for vacation in vacations:
-            # Apply country filter
-            if country_id and vacation.country_id != country_id:
-                continue
-
-            # Apply price filters
-            if min_price and vacation.price < min_price:
-                continue
-            if max_price and vacation.price > max_price:
-                continue
-
-            # Apply date filters
-            if start_date and vacation.start_date < start_date:
-                continue
-            if end_date and vacation.end_date > end_date:
-                continue
-
-            filtered_vacations.append(vacation)
-
-        # Format results and add like information
+        # Filters and like information are applied in one query
+        results = self.vacation_service.search_filtered(
+            term=query,
+            country_id=country_id,
+            min_price=min_price,
+            max_price=max_price,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id
+        )
+
         result = []
-        for vacation in filtered_vacations:
+        for vacation, likes_count, is_liked in results:
             vacation_dict = self._format_vacation_dict(vacation)
             if user_id:
-                vacation_dict['is_liked'] = self.like_service.has_user_liked(user_id, vacation.id)
-                vacation_dict['likes_count'] = self.like_service.count_by_vacation(vacation.id)
+                vacation_dict['is_liked'] = is_liked
+                vacation_dict['likes_count'] = likes_count
             result.append(vacation_dict)
 
         return result
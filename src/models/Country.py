@@ -2,6 +2,8 @@ from datetime import datetime
 from typing import Optional, Dict
 
 class Country:
+    __slots__ = ('id', 'name', 'code', 'created_at')
+
     def __init__(
         self,
         name: str,
@@ -88,6 +90,27 @@ class Country:
             created_at=created_at
         )
 
+    @classmethod
+    def from_db_row(cls, row: Dict) -> 'Country':
+        """
+        Create a Country instance from a database row.
+
+        Rows from the database are trusted, so code validation is skipped
+        and the attributes are assigned directly.
+
+        Args:
+            row: Dictionary containing country data from database
+
+        Returns:
+            New Country instance
+        """
+        country = cls.__new__(cls)
+        country.id = row['id']
+        country.name = row['name']
+        country.code = row['code']
+        country.created_at = row['created_at'] or datetime.now()
+        return country
+
     def __eq__(self, other: object) -> bool:
         """Compare two country objects."""
         if not isinstance(other, Country):
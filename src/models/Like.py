@@ -3,6 +3,8 @@ from typing import Optional, Dict
 
 
 class Like:
+    __slots__ = ('id', 'user_id', 'vacation_id', 'created_at')
+
     def __init__(
         self,
         user_id: int,
@@ -1,11 +1,30 @@
 """
 User model with password hashing and validation.
 """
+import os
 from datetime import datetime
 from typing import Optional, Dict, Any
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from argon2.low_level import Type
+
+# Argon2id parameters; tune per host with `python -m argon2` so a verify
+# lands around 250ms (lower ARGON2_MEMORY_KB on memory-constrained hosts).
+_password_hasher = PasswordHasher(
+    time_cost=int(os.getenv('ARGON2_TIME_COST', '3')),
+    memory_cost=int(os.getenv('ARGON2_MEMORY_KB', '65536')),
+    parallelism=int(os.getenv('ARGON2_PARALLELISM', '4')),
+    type=Type.ID
+)
+_ARGON2_PREFIX = '$argon2'
 
 class User:
+    __slots__ = (
+        'id', 'first_name', 'last_name', 'email',
+        'role_id', 'created_at', '_password'
+    )
+
     def __init__(
         self,
         first_name: str,
@@ -47,16 +66,29 @@ class User:
         if value:
             self.set_password(value)
 
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """Hash a plaintext password using Argon2id."""
+        return _password_hasher.hash(password)
+
     def set_password(self, password: str):
-        """Hash and set the password."""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        self._password = hashed.decode('utf-8')
+        """Hash and set the password using Argon2id."""
+        self._password = User.hash_password(password)
 
     def verify_password(self, password: str) -> bool:
-        """Verify a password against the stored hash."""
+        """
+        Verify a password against the stored hash.
+
+        Argon2id hashes are checked with argon2; anything else is treated as a
+        legacy bcrypt hash.
+        """
         if not self._password:
             return False
+        if self._password.startswith(_ARGON2_PREFIX):
+            try:
+                return _password_hasher.verify(self._password, password)
+            except (VerificationError, InvalidHashError):
+                return False
         try:
             return bcrypt.checkpw(
                 password.encode('utf-8'),
@@ -65,6 +97,23 @@ class User:
         except ValueError:
             return False
 
+    def needs_rehash(self) -> bool:
+        """
+        Check whether the stored hash should be upgraded.
+
+        Returns:
+            True if the hash is a legacy bcrypt hash or uses outdated
+            Argon2 parameters
+        """
+        if not self._password:
+            return False
+        if not self._password.startswith(_ARGON2_PREFIX):
+            return True
+        try:
+            return _password_hasher.check_needs_rehash(self._password)
+        except InvalidHashError:
+            return True
+
     def to_dict(self) -> Dict:
         """Convert user object to dictionary."""
         return {
@@ -102,6 +151,9 @@ class User:
         """
         Create a User instance from a database row.
         
+        Rows from the database are trusted, so __init__ is bypassed and the
+        attributes are assigned directly.
+
         Args:
             row: Dictionary containing user data from database
             
@@ -111,14 +163,13 @@ class User:
         if not row:
             return None
             
-        user = cls(
-            id=row['id'],
-            first_name=row['first_name'],
-            last_name=row['last_name'],
-            email=row['email'],
-            role_id=row['role_id'],
-            created_at=row['created_at']
-        )
+        user = cls.__new__(cls)
+        user.id = row['id']
+        user.first_name = row['first_name']
+        user.last_name = row['last_name']
+        user.email = row['email']
+        user.role_id = row['role_id']
+        user.created_at = row['created_at'] or datetime.now()
         user._password = row['password']  # Store the hashed password from DB
         return user
 
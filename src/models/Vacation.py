@@ -4,6 +4,11 @@ from typing import Optional, Dict
 from src.models.Country import Country
 
 class Vacation:
+    __slots__ = (
+        'id', 'country_id', 'destination', 'description', 'start_date',
+        'end_date', 'price', 'image_url', 'created_at', 'country'
+    )
+
     def __init__(
         self,
         country_id: int,
@@ -58,8 +63,11 @@ class Vacation:
     def _validate_date(value: date) -> date:
         """Convert and validate date."""
         if isinstance(value, str):
+            # fromisoformat also takes compact (YYYYMMDD) and week dates
+            if len(value) != 10 or value[4] != '-' or value[7] != '-':
+                raise ValueError("Invalid date format. Use YYYY-MM-DD")
             try:
-                value = datetime.strptime(value, '%Y-%m-%d').date()
+                value = date.fromisoformat(value)
             except ValueError:
                 raise ValueError("Invalid date format. Use YYYY-MM-DD")
         elif not isinstance(value, date):
@@ -77,7 +85,9 @@ class Vacation:
     @staticmethod
     def _validate_price(price: Decimal) -> Decimal:
         """Validate price."""
-        if isinstance(price, (int, float, str)):
+        if isinstance(price, int) and not isinstance(price, bool):
+            price = Decimal(price)  # Exact already, no need to go through str
+        elif isinstance(price, (float, str)):
             price = Decimal(str(price))
         if not isinstance(price, Decimal):
             raise ValueError("Price must be a decimal number")
@@ -145,6 +155,35 @@ class Vacation:
             country=country
         )
 
+    @classmethod
+    def from_db_row(cls, row: Dict, country: Optional[Country] = None) -> 'Vacation':
+        """
+        Create a Vacation instance from a database row.
+
+        Rows from the database are trusted, so __init__ and its validation
+        (including the no-past-start-date rule) are bypassed and the
+        attributes are assigned directly.
+
+        Args:
+            row: Dictionary containing vacation data from database
+            country: Associated Country object (optional)
+
+        Returns:
+            New Vacation instance
+        """
+        vacation = cls.__new__(cls)
+        vacation.id = row['id']
+        vacation.country_id = row['country_id']
+        vacation.destination = row['destination']
+        vacation.description = row['description']
+        vacation.start_date = row['start_date']
+        vacation.end_date = row['end_date']
+        vacation.price = row['price']
+        vacation.image_url = row['image_url']
+        vacation.created_at = row['created_at'] or datetime.now()
+        vacation.country = country
+        return vacation
+
     def __eq__(self, other: object) -> bool:
         """Compare two vacation objects."""
         if not isinstance(other, Vacation):
@@ -1,17 +1,38 @@
 """
 Test configuration and fixtures.
 """
+import os
+from pathlib import Path
+
+# Cheapest valid Argon2 parameters for tests; must be set before src.models.User
+# is imported, since the hasher is built at import time
+os.environ.setdefault('ARGON2_TIME_COST', '1')
+os.environ.setdefault('ARGON2_MEMORY_KB', '8')
+os.environ.setdefault('ARGON2_PARALLELISM', '1')
+
 import pytest
 from src.config import get_test_config
 from src.query import init_pool, close_pool, query
+from src.DAL.AuthService import AuthService
+from src.DAL.CountryService import CountryService
+from src.DAL.VacationService import VacationService
+
+# Resolved from this file rather than the working directory
+_SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'SQL' / 'schema.sql'
+
+
+@pytest.fixture(scope="session")
+def session_pool_options():
+    """Pool settings for the shared session pool; restore from these after swapping it."""
+    return {'prewarm': True, 'synchronous_commit': False}
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_db():
+def setup_test_db(session_pool_options):
     """Initialize test database for all tests."""
     print("\nInitializing test database...")  # Debug print
     config, _ = get_test_config()
-    init_pool(config)
+    init_pool(config, **session_pool_options)
     
     # Drop existing schema
     cleanup_sql = """
@@ -21,13 +42,20 @@ def setup_test_db():
         DROP TABLE IF EXISTS users CASCADE;
         DROP TABLE IF EXISTS countries CASCADE;
     """
-    query(cleanup_sql, commit=True)
     
-    # Initialize schema
+    # The test database is rebuilt every session, so skip WAL for its tables;
+    # referencing tables go first since logged tables can't point at unlogged ones
+    unlogged_sql = """
+        ALTER TABLE likes SET UNLOGGED;
+        ALTER TABLE vacations SET UNLOGGED;
+        ALTER TABLE users SET UNLOGGED;
+        ALTER TABLE countries SET UNLOGGED;
+    """
+
+    # Initialize schema; drop, create and tweak go out in one round trip
     print("Creating schema...")  # Debug print
-    with open('SQL/schema.sql', 'r') as f:
-        schema_sql = f.read()
-        query(schema_sql, commit=True)
+    schema_sql = _SCHEMA_PATH.read_text()
+    query(cleanup_sql + schema_sql + unlogged_sql, commit=True)
     print("Schema created successfully")  # Debug print
     
     yield
@@ -40,8 +68,11 @@ def setup_test_db():
 def cleanup_test_data():
     """Clean up test data after each test."""
     yield
-    # Clean up all tables except admin user in correct order
-    query("DELETE FROM likes", commit=True)  # Delete likes first
-    query("DELETE FROM vacations", commit=True)  # Then vacations
-    query("DELETE FROM users WHERE email != 'admin@example.com'", commit=True)  # Then users
-    query("DELETE FROM countries", commit=True)  # Finally countries 
\ No newline at end of file
+    # Clean up all tables except admin user in one round trip and transaction
+    query("""
+        TRUNCATE likes, vacations, countries;
+        DELETE FROM users WHERE email != 'admin@example.com';
+    """, commit=True)
+    CountryService.clear_cache()  # Rows were removed behind the service's back
+    VacationService.clear_cache()
+    AuthService.clear_token_cache()
\ No newline at end of file
@@ -2,6 +2,7 @@
 import pytest
 from datetime import datetime
 from src.facades.AuthFacade import AuthFacade
+from src.DAL.AuthService import AuthService
 from src.models.User import User
 from src.DAL.UserService import UserService
 from src.query import query
@@ -49,6 +50,16 @@ def test_register_success(auth_facade, test_user_data):
     assert user_data['email'] == test_user_data['email']
 
 
+def test_register_skips_login(auth_facade, test_user_data, monkeypatch):
+    """Test registration mints the token without a separate login."""
+    def fail_login(*args, **kwargs):
+        raise AssertionError("register should not call login")
+    monkeypatch.setattr(AuthService, 'login', fail_login)
+
+    _, token = auth_facade.register(**test_user_data)
+    assert auth_facade.verify_token(token)['email'] == test_user_data['email']
+
+
 def test_register_duplicate_email(auth_facade, test_user_data):
     """Test registration with duplicate email."""
     # Register first user
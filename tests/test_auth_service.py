@@ -3,9 +3,12 @@ Tests for the AuthService class.
 """
 import pytest
 from datetime import datetime, timedelta, UTC
+import hmac
 import jwt
-from src.DAL.AuthService import AuthService
+import bcrypt
+from src.DAL.AuthService import AuthService, _hmac_pads, _token_key
 from src.models.User import User
+from src.DAL.UserService import UserService
 
 
 def test_register_success():
@@ -211,4 +214,274 @@ def test_reset_password_request():
     assert AuthService.request_password_reset(email) is not None
     
     # Request for non-existent email should return None
-    assert AuthService.request_password_reset("nonexistent@example.com") is None 
\ No newline at end of file
+    assert AuthService.request_password_reset("nonexistent@example.com") is None
+
+
+def test_verify_token_uses_cache(monkeypatch):
+    """Test that a verified token is served from cache without a DB lookup."""
+    email = "cache.test@example.com"
+    user = AuthService.register(
+        first_name="Cache",
+        last_name="Test",
+        email=email,
+        password="password123"
+    )
+    _, token = AuthService.login(email, "password123")
+
+    assert AuthService.verify_token(token).id == user.id
+
+    # A second verification must not hit the database
+    def fail_get_by_id(user_id):
+        raise AssertionError("verify_token should have used the cache")
+    monkeypatch.setattr(UserService, "get_by_id", fail_get_by_id)
+
+    assert AuthService.verify_token(token).id == user.id
+
+
+def test_verify_token_invalid_not_cached():
+    """Test that invalid tokens are never cached."""
+    invalid_token = "invalid.token.here"
+    assert AuthService.verify_token(invalid_token) is None
+    assert _token_key(invalid_token) not in AuthService._token_cache
+
+
+def test_change_password_invalidates_cached_tokens():
+    """Test that changing a password evicts the user's cached tokens."""
+    email = "cache.evict@example.com"
+    user = AuthService.register(
+        first_name="Cache",
+        last_name="Evict",
+        email=email,
+        password="old_password"
+    )
+    _, token = AuthService.login(email, "old_password")
+    AuthService.verify_token(token)
+    assert _token_key(token) in AuthService._token_cache
+
+    AuthService.change_password(user.id, "old_password", "new_password")
+    assert _token_key(token) not in AuthService._token_cache
+
+
+def test_user_update_and_delete_invalidate_cached_tokens():
+    """Test that role changes and deletion are seen by cached tokens."""
+    email = "cache.demote@example.com"
+    user = AuthService.register(
+        first_name="Cache",
+        last_name="Demote",
+        email=email,
+        password="password123"
+    )
+    user.role_id = 'admin'
+    UserService.update(user)
+    _, token = AuthService.login(email, "password123")
+    assert AuthService.verify_token(token).role_id == 'admin'
+
+    # Demoting the user invalidates the token issued for the admin role
+    user.role_id = 'user'
+    UserService.update(user)
+    assert AuthService.verify_token(token) is None
+
+    _, token = AuthService.login(email, "password123")
+    assert AuthService.verify_token(token) is not None
+    UserService.delete(user.id)
+    assert AuthService.verify_token(token) is None
+
+
+def test_verify_token_cached_copy():
+    """Test that cached tokens hand each caller an independent User."""
+    AuthService.register(
+        first_name="Cache",
+        last_name="Copy",
+        email="cache.copy@example.com",
+        password="password123"
+    )
+    _, token = AuthService.login("cache.copy@example.com", "password123")
+    first = AuthService.verify_token(token)
+    first.role_id = 'admin'
+
+    again = AuthService.verify_token(token)
+    assert again is not first
+    assert again.role_id == 'user'
+
+
+def test_verify_token_skips_cache_after_concurrent_invalidation(monkeypatch):
+    """Test a user row loaded before an invalidation is not cached."""
+    user = AuthService.register(
+        first_name="Cache",
+        last_name="Race",
+        email="cache.race@example.com",
+        password="password123"
+    )
+    _, token = AuthService.login("cache.race@example.com", "password123")
+    get_by_id = UserService.get_by_id
+
+    def get_by_id_then_invalidate(user_id):
+        loaded = get_by_id(user_id)
+        AuthService.invalidate_user_tokens(user_id)  # A concurrent update lands
+        return loaded
+
+    monkeypatch.setattr(UserService, "get_by_id", get_by_id_then_invalidate)
+    assert AuthService.verify_token(token).id == user.id
+    assert _token_key(token) not in AuthService._token_cache
+
+
+def test_token_cache_evicts_oldest_when_full(monkeypatch):
+    """Test a full token cache drops its oldest entry to make room."""
+    monkeypatch.setattr(AuthService, "TOKEN_CACHE_MAX_SIZE", 2)
+    AuthService.register(
+        first_name="Cache",
+        last_name="Full",
+        email="cache.full@example.com",
+        password="password123"
+    )
+    tokens = []
+    for i in range(3):
+        # Login tokens issued within one second are identical; refreshed ones
+        # carry a unique jti
+        _, token = AuthService.login("cache.full@example.com", "password123")
+        tokens.append(AuthService.refresh_token(token))
+    for token in tokens:
+        assert AuthService.verify_token(token) is not None
+
+    assert len(AuthService._token_cache) == 2
+    assert _token_key(tokens[0]) not in AuthService._token_cache
+    assert _token_key(tokens[2]) in AuthService._token_cache
+
+
+def test_refresh_token_invalidates_old_token():
+    """Test that refreshing a token evicts the old token from the cache."""
+    email = "cache.refresh@example.com"
+    AuthService.register(
+        first_name="Cache",
+        last_name="Refresh",
+        email=email,
+        password="password123"
+    )
+    _, token = AuthService.login(email, "password123")
+    AuthService.verify_token(token)
+
+    new_token = AuthService.refresh_token(token)
+    assert _token_key(token) not in AuthService._token_cache
+    assert AuthService.verify_token(new_token) is not None
+
+
+def test_verify_token_does_not_print(capsys):
+    """Test that token verification does not write to stdout."""
+    assert AuthService.verify_token("invalid.token.here") is None
+    assert capsys.readouterr().out == ""
+
+
+def test_login_upgrades_legacy_hash():
+    """Test that logging in with a legacy bcrypt hash upgrades it to Argon2id."""
+    email = "legacy.login@example.com"
+    user = AuthService.register(
+        first_name="Legacy",
+        last_name="Login",
+        email=email,
+        password="password123"
+    )
+    legacy_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(4)).decode('utf-8')
+    UserService._execute_query(
+        "UPDATE users SET password = %s WHERE id = %s",
+        [legacy_hash, user.id]
+    )
+
+    AuthService.login(email, "password123")
+
+    upgraded = UserService.get_by_id(user.id)
+    assert upgraded.password_hash.startswith("$argon2id$")
+    assert upgraded.verify_password("password123")
+
+
+def test_verify_token_missing_claims():
+    """Test that tokens missing required claims are rejected."""
+    email = "claims.test@example.com"
+    user = AuthService.register(
+        first_name="Claims",
+        last_name="Test",
+        email=email,
+        password="password123"
+    )
+
+    now = datetime.now(UTC)
+    payload = {
+        'sub': user.id,
+        'email': user.email,
+        'iat': now,
+        'exp': now + timedelta(hours=1)
+    }
+    token = jwt.encode(
+        payload,
+        AuthService.JWT_SECRET,
+        algorithm=AuthService.JWT_ALGORITHM
+    )
+
+    assert AuthService.verify_token(token) is None
+
+
+def test_verify_token_email_changed():
+    """Test that a token is rejected after the user's email changes."""
+    email = "old.email@example.com"
+    user = AuthService.register(
+        first_name="Email",
+        last_name="Change",
+        email=email,
+        password="password123"
+    )
+    token = AuthService.generate_token(user)
+
+    user.email = "new.email@example.com"
+    UserService.update(user)
+
+    assert AuthService.verify_token(token) is None
+
+
+def test_generate_token_matches_pyjwt():
+    """Test that generated tokens are byte-identical to PyJWT's output."""
+    user = User(
+        id=42,
+        first_name="Token",
+        last_name="Format",
+        email="token.format@example.com",
+        role_id="user"
+    )
+    token = AuthService.generate_token(user)
+
+    decoded = jwt.decode(
+        token,
+        AuthService.JWT_SECRET,
+        algorithms=[AuthService.JWT_ALGORITHM]
+    )
+    assert decoded['sub'] == 42
+    assert decoded['email'] == "token.format@example.com"
+    assert decoded['exp'] - decoded['iat'] == AuthService.JWT_EXPIRY_HOURS * 3600
+    assert token == jwt.encode(
+        decoded,
+        AuthService.JWT_SECRET,
+        algorithm=AuthService.JWT_ALGORITHM
+    )
+
+
+@pytest.mark.parametrize("key", [b"short", b"k" * 64, b"long-key" * 20])
+def test_hmac_pads_match_stdlib(key):
+    """Test that precomputed HMAC states match the stdlib HMAC."""
+    inner, outer = _hmac_pads(key)
+    inner.update(b"header.payload")
+    outer.update(inner.digest())
+    assert outer.digest() == hmac.digest(key, b"header.payload", "sha256")
+
+
+def test_token_cache_does_not_store_raw_tokens():
+    """Test the verified-token cache is keyed by token digest."""
+    user = AuthService.register(
+        first_name="Digest",
+        last_name="Key",
+        email="digest.key@example.com",
+        password="password123"
+    )
+    _, token = AuthService.login("digest.key@example.com", "password123")
+    assert AuthService.verify_token(token).id == user.id
+
+    assert _token_key(token) in AuthService._token_cache
+    assert all(isinstance(key, bytes) and len(key) == 32
+               for key in AuthService._token_cache)
@@ -5,10 +5,12 @@ import os
 import pytest
 from src.config import (
     DBConfig,
+    get_config,
     get_connection_string,
     load_db_config,
     get_staging_config,
-    get_test_config
+    get_test_config,
+    _read_env_file
 )
 
 
@@ -105,4 +107,23 @@ def test_get_test_config():
     assert isinstance(url, str)
     assert 'postgresql://' in url
     assert config.database == 'vacation_db_test'
-    assert str(config.port) == '5433' 
\ No newline at end of file
+    assert str(config.port) == '5433'
+
+
+def test_env_file_parsed_once():
+    """Test repeated config loads reuse the parsed environment file."""
+    get_test_config()
+    hits = _read_env_file.cache_info().hits
+
+    config, _ = get_test_config()
+
+    assert _read_env_file.cache_info().hits == hits + 1
+    assert config.database == 'vacation_db_test'
+
+
+def test_get_config_returns_copy():
+    """Test callers cannot modify the cached application configuration."""
+    config = get_config()
+    config['POSTGRES_HOST'] = 'changed'
+
+    assert get_config()['POSTGRES_HOST'] != 'changed'
@@ -2,47 +2,13 @@ import pytest
 from datetime import datetime, UTC
 from src.models.Country import Country
 from src.DAL.CountryService import CountryService
-from src.config import get_test_config
-from src.query import init_pool, close_pool, query
-
-@pytest.fixture(scope="session", autouse=True)
-def setup_db():
-    """Initialize database connection for tests."""
-    config, _ = get_test_config()
-    init_pool(config)
-    
-    # Drop existing schema
-    cleanup_sql = """
-        DROP TYPE IF EXISTS role_enum CASCADE;
-        DROP TABLE IF EXISTS likes CASCADE;
-        DROP TABLE IF EXISTS vacations CASCADE;
-        DROP TABLE IF EXISTS users CASCADE;
-        DROP TABLE IF EXISTS countries CASCADE;
-    """
-    query(cleanup_sql, commit=True)
-    
-    # Initialize schema
-    with open('SQL/schema.sql', 'r') as f:
-        schema_sql = f.read()
-        query(schema_sql, commit=True)
-    
-    yield
-    close_pool()
+from src.query import query
 
 @pytest.fixture
 def country_service():
     """Get a CountryService instance."""
     return CountryService()
 
-@pytest.fixture(autouse=True)
-def cleanup_countries():
-    """Clean up countries table after each test."""
-    yield
-    # Clean up in correct order to avoid foreign key violations
-    query("DELETE FROM likes", commit=True)  # Delete likes first
-    query("DELETE FROM vacations", commit=True)  # Then vacations
-    query("DELETE FROM countries", commit=True)  # Finally countries
-
 # Model Tests
 def test_country_creation():
     """Test creating a Country object."""
@@ -134,6 +100,9 @@ def test_get_by_code():
     assert retrieved is not None
     assert retrieved.id == created.id
     
+    # Test with surrounding whitespace
+    assert CountryService.get_by_code(" BR ").id == created.id
+
     # Test non-existent code
     assert CountryService.get_by_code("XX") is None
 
@@ -199,8 +168,7 @@ def test_get_all_countries():
         Country(name="Germany", code="DE"),
         Country(name="Italy", code="IT")
     ]
-    for country in countries:
-        CountryService.create(country)
+    CountryService.create_many(countries)
     
     # Retrieve all countries
     all_countries = CountryService.get_all()
@@ -213,9 +181,11 @@ def test_get_all_countries():
 def test_search_countries():
     """Test searching countries."""
     # Create test countries
-    CountryService.create(Country(name="Spain", code="ES"))
-    CountryService.create(Country(name="Portugal", code="PT"))
-    CountryService.create(Country(name="Greece", code="GR"))
+    CountryService.create_many([
+        Country(name="Spain", code="ES"),
+        Country(name="Portugal", code="PT"),
+        Country(name="Greece", code="GR")
+    ])
     
     # Search by name
     results = CountryService.search("Port")
@@ -235,6 +205,25 @@ def test_search_countries():
     results = CountryService.search("XYZ")
     assert len(results) == 0
 
+def test_create_many_countries():
+    """Test creating several countries in one statement."""
+    created = CountryService.create_many([
+        Country(name="Norway", code="NO"),
+        Country(name="Sweden", code="SE")
+    ])
+    assert {c.code for c in created} == {"NO", "SE"}
+    assert all(c.id is not None for c in created)
+    assert CountryService.get_by_code("SE").name == "Sweden"
+    assert CountryService.create_many([]) == []
+
+    # A duplicate code rolls back the whole batch
+    with pytest.raises(ValueError, match="One or more country codes already exist"):
+        CountryService.create_many([
+            Country(name="Denmark", code="DK"),
+            Country(name="Kingdom of Norway", code="NO")
+        ])
+    assert CountryService.get_by_code("DK") is None
+
 def test_count_countries():
     """Test counting countries."""
     initial_count = CountryService.count()
@@ -243,4 +232,71 @@ def test_count_countries():
     CountryService.create(Country(name="Netherlands", code="NL"))
     CountryService.create(Country(name="Belgium", code="BE"))
     
-    assert CountryService.count() == initial_count + 2 
\ No newline at end of file
+    assert CountryService.count() == initial_count + 2
+
+def test_create_duplicate_name():
+    """Test creating a country with duplicate name."""
+    CountryService.create(Country(name="Canada", code="CA"))
+
+    with pytest.raises(ValueError, match="Country with name Canada already exists"):
+        CountryService.create(Country(name="Canada", code="CN"))
+
+def test_delete_nonexistent_country():
+    """Test deleting a country that doesn't exist."""
+    assert CountryService.delete(999999) is False
+
+def test_get_by_code_cached():
+    """Test that country lookups are cached until the next write."""
+    created = CountryService.create(Country(name="Norway", code="NO"))
+    assert CountryService.get_by_code("NO").id == created.id
+
+    # A write made outside the service is not seen until the cache is cleared
+    query("UPDATE countries SET name = 'Kingdom of Norway' WHERE id = %s",
+          [created.id], commit=True)
+    assert CountryService.get_by_code("NO").name == "Norway"
+
+    # Writes through the service invalidate the cache
+    created.name = "Norge"
+    CountryService.update(created)
+    assert CountryService.get_by_code("NO").name == "Norge"
+    assert CountryService.get_by_id(created.id).name == "Norge"
+
+def test_iter_all_countries():
+    """Test lazily iterating over all countries."""
+    CountryService.create(Country(name="Sweden", code="SE"))
+    CountryService.create(Country(name="Finland", code="FI"))
+
+    names = [c.name for c in CountryService.iter_all()]
+    assert names == [c.name for c in CountryService.get_all()]
+    assert {"Sweden", "Finland"}.issubset(names)
+
+def test_country_from_db_row():
+    """Test creating Country from a trusted database row."""
+    now = datetime.now()
+    country = Country.from_db_row({
+        'id': 1,
+        'name': "United States",
+        'code': "US",
+        'created_at': now
+    })
+
+    assert country.id == 1
+    assert country.code == "US"
+    assert country.created_at == now
+    assert not hasattr(country, '__dict__')
+
+def test_search_countries_by_exact_code():
+    """Test that codes are matched exactly and case-insensitively."""
+    CountryService.create(Country(name="Switzerland", code="CH"))
+
+    results = CountryService.search(" ch ")
+    assert [c.code for c in results] == ["CH"]
+
+    # Partial codes don't match
+    assert CountryService.search("H") == []
+
+def test_search_countries_strips_term():
+    """Test surrounding whitespace is ignored for name matches too."""
+    CountryService.create(Country(name="Chile", code="CL"))
+
+    assert [c.name for c in CountryService.search(" chi ")] == ["Chile"]
@@ -2,7 +2,7 @@
 Tests for the Like model and service.
 """
 import pytest
-from datetime import datetime
+from datetime import date, datetime
 from src.models.Like import Like
 from src.DAL.LikeService import LikeService
 from src.models.User import User
@@ -11,74 +11,46 @@ from src.models.Country import Country
 from src.DAL.UserService import UserService
 from src.DAL.VacationService import VacationService
 from src.DAL.CountryService import CountryService
-from src.config import get_test_config
-from src.query import init_pool, close_pool, query
-
-
-@pytest.fixture(scope="session", autouse=True)
-def setup_database():
-    """Initialize database connection."""
-    config, _ = get_test_config()
-    init_pool(config)
-    yield
-    close_pool()
-
-
-@pytest.fixture(autouse=True)
-def cleanup_db():
-    """Clean up test data after each test."""
-    yield
-    # Clean up any test data
-    query("DELETE FROM likes", commit=True)
-    query("DELETE FROM vacations", commit=True)
-    query("DELETE FROM users WHERE email LIKE 'test%@example.com'", commit=True)
-    query("DELETE FROM countries WHERE code LIKE 'T%'", commit=True)
+from src.query import query
 
 
 @pytest.fixture
 def setup_db():
     """Set up test database."""
-    # Create test data with unique email
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    # Tables are emptied after every test, so fixed values can't collide
     user = User(
         first_name="Test",
         last_name="User",
-        email=f"test{timestamp}@example.com",
+        email="test.like@example.com",
         password="password123"
     )
     user = UserService.create(user)
 
     country = Country(
         name='Test Country',
-        code=f'T{chr(65 + (int(timestamp[-2:]) % 26))}'  # Use T + letter (A-Z)
+        code='TC'
     )
     country = CountryService.create(country)
 
+    today = date.today()
     vacation = Vacation(
         country_id=country.id,
         destination="Test Destination",
         description="Test Description",
-        start_date=datetime.now().date(),
-        end_date=datetime.now().date(),
+        start_date=today,
+        end_date=today,
         price=100.00,
         image_url="test.jpg"
     )
     vacation = VacationService.create(vacation)
 
+    # Cleanup is handled by conftest.py cleanup_test_data fixture
     yield {
         'user': user,
         'vacation': vacation,
         'country': country
     }
 
-    # Cleanup
-    try:
-        UserService.delete(user.id)
-        VacationService.delete(vacation.id)
-        CountryService.delete(country.id)
-    except:
-        pass
-
 
 def test_like_creation():
     """Test creating a Like instance."""
@@ -88,6 +60,7 @@ def test_like_creation():
     assert like.vacation_id == 1
     assert like.id is None
     assert isinstance(like.created_at, datetime)
+    assert not hasattr(like, '__dict__')
 
 
 def test_like_to_dict():
@@ -223,4 +196,72 @@ def test_get_popular_vacations(setup_db):
     popular = LikeService.get_popular_vacations(limit=1)
     assert len(popular) == 1
     assert popular[0]['id'] == setup_db['vacation'].id
-    assert popular[0]['like_count'] == 1 
\ No newline at end of file
+    assert popular[0]['like_count'] == 1
+
+
+def test_create_like_nonexistent_user(setup_db):
+    """Test creating a like for a user that doesn't exist."""
+    like = Like(user_id=999999, vacation_id=setup_db['vacation'].id)
+
+    with pytest.raises(ValueError, match="User with id 999999 not found"):
+        LikeService.create(like)
+
+
+def test_create_like_nonexistent_vacation(setup_db):
+    """Test creating a like for a vacation that doesn't exist."""
+    like = Like(user_id=setup_db['user'].id, vacation_id=999999)
+
+    with pytest.raises(ValueError, match="Vacation with id 999999 not found"):
+        LikeService.create(like)
+
+
+def test_get_by_user_projection(setup_db):
+    """Test that liked vacations carry only the vacation and like fields."""
+    LikeService.create(Like(
+        user_id=setup_db['user'].id,
+        vacation_id=setup_db['vacation'].id
+    ))
+
+    row = LikeService.get_by_user(setup_db['user'].id)[0]
+    assert row['destination'] == setup_db['vacation'].destination
+    assert row['like_id'] is not None
+    assert row['like_count'] == 1
+    assert not any(key.startswith('c_') for key in row)
+
+
+def test_like_indexes(setup_db):
+    """Test likes are indexed by vacation and by (user, vacation) only."""
+    result = query("SELECT indexdef FROM pg_indexes WHERE tablename = 'likes'")
+    defs = [row['indexdef'] for row in result]
+    assert any('(vacation_id)' in d for d in defs)
+    assert any('UNIQUE' in d and '(user_id, vacation_id)' in d for d in defs)
+    assert not any(d.endswith('(user_id)') for d in defs)
+
+
+def test_try_create_and_try_delete(setup_db):
+    """Test single-round-trip like/unlike report existence and duplicates."""
+    user_id = setup_db['user'].id
+    vacation_id = setup_db['vacation'].id
+
+    exists, like = LikeService.try_create(user_id, vacation_id)
+    assert exists is True
+    assert like.id is not None and like.vacation_id == vacation_id
+    assert LikeService.try_create(user_id, vacation_id) == (True, None)
+    assert LikeService.try_create(user_id, 999999) == (False, None)
+
+    assert LikeService.try_delete(user_id, vacation_id) == (True, True)
+    assert LikeService.try_delete(user_id, vacation_id) == (True, False)
+    assert LikeService.try_delete(user_id, 999999) == (False, False)
+
+
+def test_create_many_likes(setup_db):
+    """Test creating likes in bulk, skipping existing ones."""
+    user_id = setup_db['user'].id
+    vacation_id = setup_db['vacation'].id
+    LikeService.create(Like(user_id=user_id, vacation_id=vacation_id))
+
+    assert LikeService.create_many([Like(user_id=user_id, vacation_id=vacation_id)]) == []
+    assert LikeService.create_many([]) == []
+
+    with pytest.raises(ValueError, match="vacations not found"):
+        LikeService.create_many([Like(user_id=user_id, vacation_id=999999)])
@@ -2,8 +2,11 @@
 Tests for the query module using real database connections.
 """
 import pytest
+import psycopg
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from src.config import get_test_config
-from src.query import init_pool, query, close_pool, get_cursor, get_connection
+from src.query import init_pool, query, get_cursor, get_connection, stream, executemany
 
 
 @pytest.fixture(scope="module")
@@ -14,11 +17,16 @@ def db_config():
 
 
 @pytest.fixture(scope="module")
-def pool(db_config):
-    """Initialize and clean up the connection pool."""
+def pool(db_config, session_pool_options):
+    """
+    Swap in a default-sized pool for this module.
+
+    Some tests rely on sequential queries reusing a single idle connection,
+    which the prewarmed session pool from conftest.py doesn't guarantee.
+    """
     init_pool(db_config)
     yield
-    close_pool()
+    init_pool(db_config, **session_pool_options)
 
 
 def test_simple_select(pool):
@@ -65,15 +73,12 @@ def test_insert_and_select(pool):
         )
     ''', commit=True)
     
-    # Insert data
-    query(
-        'INSERT INTO test_table (name) VALUES (%s)',
+    # Insert and read back in one round trip
+    result = query(
+        'WITH ins AS (INSERT INTO test_table (name) VALUES (%s) RETURNING *) SELECT * FROM ins',
         ['test_name'],
         commit=True
     )
-    
-    # Select data
-    result = query('SELECT * FROM test_table')
     assert len(result) == 1
     assert result[0]['name'] == 'test_name'
 
@@ -118,12 +123,20 @@ def test_connection_context_manager(pool):
             assert result['answer'] == 42
 
 
+def test_sequential_numbers(pool):
+    """Test a multi-row result generated server-side in one query."""
+    result = query('SELECT n as num FROM generate_series(0, %s) n', [4])
+    assert [row['num'] for row in result] == [0, 1, 2, 3, 4]
+
+
 def test_concurrent_queries(pool):
-    """Test running multiple queries in sequence."""
-    results = []
-    for i in range(5):
-        result = query('SELECT %s as num', [i])
-        results.append(result[0]['num'])
+    """Test running multiple queries at once from different threads."""
+    def run(i):
+        # The sleep keeps each connection checked out long enough to overlap
+        return query('SELECT pg_sleep(0.01), %s::int as num', [i])[0]['num']
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(run, range(5)))
     
     assert results == [0, 1, 2, 3, 4]
 
@@ -135,4 +148,89 @@ def test_special_characters(pool):
         'SELECT %s as special_text',
         [special_text]
     )
-    assert result[0]['special_text'] == special_text 
\ No newline at end of file
+    assert result[0]['special_text'] == special_text
+
+
+def test_stream(pool):
+    """Test streaming rows through a server-side cursor."""
+    rows = stream('SELECT generate_series(1, 25) as num', itersize=10)
+    assert [row['num'] for row in rows] == list(range(1, 26))
+
+
+def test_stream_early_exit(pool):
+    """Test that abandoning a stream releases its connection."""
+    with closing(stream('SELECT generate_series(1, 100) as num', itersize=10)) as rows:
+        assert next(rows)['num'] == 1
+
+    # The pool is still usable afterwards
+    assert query('SELECT 1 as one')[0]['one'] == 1
+
+
+def test_query_prepare_opt_in(db_config):
+    """Test that only queries opting in are prepared on first execution."""
+    # A single-connection pool, so every query below runs on the same backend
+    init_pool(db_config, min_size=1, max_size=1)
+    try:
+        prepared_sql = (
+            "SELECT statement FROM pg_prepared_statements "
+            "WHERE statement LIKE 'SELECT $1::int * % as product'"
+        )
+        assert query('SELECT %s::int * 5 as product', [6])[0]['product'] == 30
+        assert query('SELECT %s::int * 7 as product', [6], prepare=True)[0]['product'] == 42
+
+        prepared = [row['statement'] for row in query(prepared_sql)]
+        assert prepared == ['SELECT $1::int * 7 as product']
+        assert query('SELECT %s::int * 7 as product', [2], prepare=True)[0]['product'] == 14
+    finally:
+        init_pool(db_config)
+
+
+def test_multi_statement_query_not_prepared(pool):
+    """Test that parameterless multi-statement SQL still runs."""
+    assert query('SELECT 1 as one; SELECT 2 as two')[0]['one'] == 1
+
+
+def test_pool_replaces_broken_connection(db_config):
+    """Test that a checked pool replaces a connection killed server-side."""
+    init_pool(db_config, min_size=1, max_size=1, check_connections=True)
+    try:
+        pid = query('SELECT pg_backend_pid() as pid')[0]['pid']
+
+        # Simulate a database restart by terminating the pooled backend
+        _, url = get_test_config()
+        with psycopg.connect(url, autocommit=True) as admin:
+            admin.execute('SELECT pg_terminate_backend(%s)', [pid])
+
+        new_pid = query('SELECT pg_backend_pid() as pid')[0]['pid']
+        assert new_pid != pid
+    finally:
+        init_pool(db_config)
+
+
+def test_executemany(pool):
+    """Test inserting a batch of rows in one call."""
+    rows = [(f'Batch Country {i}', f'Q{chr(65 + i)}') for i in range(5)]
+    executemany('INSERT INTO countries (name, code) VALUES (%s, %s)', rows)
+
+    result = query("SELECT name, code FROM countries WHERE name LIKE 'Batch Country %' ORDER BY code")
+    assert [(r['name'], r['code']) for r in result] == rows
+
+
+def test_init_pool_prewarm(pool, db_config):
+    """Test prewarm opens every connection before init_pool returns."""
+    prewarmed = init_pool(db_config, max_size=3, prewarm=True)
+    try:
+        assert prewarmed.min_size == 3
+        assert prewarmed.get_stats()['pool_size'] == 3
+    finally:
+        init_pool(db_config)
+
+
+def test_init_pool_synchronous_commit_off(pool, db_config):
+    """Test synchronous_commit can be turned off for every pooled connection."""
+    assert query('SHOW synchronous_commit')[0]['synchronous_commit'] == 'on'
+    init_pool(db_config, synchronous_commit=False)
+    try:
+        assert query('SHOW synchronous_commit')[0]['synchronous_commit'] == 'off'
+    finally:
+        init_pool(db_config)
@@ -1,36 +1,26 @@
 """
 Tests for database seeding functionality.
 """
-import pytest
-from src.config import get_test_config
-from src.query import init_pool, close_pool, query
-from src.DAL.seed import seed_database
-
-
-@pytest.fixture(scope="module", autouse=True)
-def setup_test_db():
-    """Initialize test database for seed tests."""
-    config, _ = get_test_config()
-    init_pool(config)
-    yield
-    close_pool()
+from src.query import query
+from src.DAL.seed import seed_database, check_tables_exist
 
 
 def clean_database():
     """Clean all tables in the database."""
-    query("DELETE FROM likes", commit=True)
-    query("DELETE FROM vacations", commit=True)
-    query("DELETE FROM users", commit=True)  # Delete all users including admin
-    query("DELETE FROM countries", commit=True)
+    # Includes the admin user; one round trip and transaction
+    query("TRUNCATE likes, vacations, users, countries", commit=True)
 
 
 def get_table_counts():
     """Get the count of records in each table."""
-    countries_count = query("SELECT COUNT(*) as count FROM countries")[0]['count']
-    users_count = query("SELECT COUNT(*) as count FROM users")[0]['count']
-    vacations_count = query("SELECT COUNT(*) as count FROM vacations")[0]['count']
-    likes_count = query("SELECT COUNT(*) as count FROM likes")[0]['count']
-    return countries_count, users_count, vacations_count, likes_count
+    counts = query("""
+        SELECT
+            (SELECT COUNT(*) FROM countries) as countries,
+            (SELECT COUNT(*) FROM users) as users,
+            (SELECT COUNT(*) FROM vacations) as vacations,
+            (SELECT COUNT(*) FROM likes) as likes
+    """)[0]
+    return counts['countries'], counts['users'], counts['vacations'], counts['likes']
 
 
 def test_check_tables_exist_empty():
@@ -66,6 +56,15 @@ def test_check_tables_exist_with_data():
     assert likes_count == 0, "Likes table should be empty"
 
 
+def test_check_tables_exist_result():
+    """Test check_tables_exist reports empty and seeded databases."""
+    clean_database()
+    assert check_tables_exist() is False
+
+    seed_database()
+    assert check_tables_exist() is True
+
+
 def test_seed_database():
     """Test the complete seeding process."""
     # Clean the database completely
@@ -105,4 +104,13 @@ def test_seed_database_skip():
     assert initial_counts[0] == final_counts[0], "Countries count should not change"
     assert initial_counts[1] == final_counts[1], "Users count should not change"
     assert initial_counts[2] == final_counts[2], "Vacations count should not change"
-    assert initial_counts[3] == final_counts[3], "Likes count should not change" 
\ No newline at end of file
+    assert initial_counts[3] == final_counts[3], "Likes count should not change"
+
+
+def test_seed_database_logs_instead_of_printing(capsys, caplog):
+    """Test seeding reports progress through logging, not stdout."""
+    with caplog.at_level("INFO", logger="src.DAL.seed"):
+        seed_database()
+
+    assert capsys.readouterr().out == ""
+    assert "Starting database check..." in caplog.messages
@@ -1,43 +1,13 @@
 import pytest
+import bcrypt
+import psycopg
+from pathlib import Path
 from datetime import datetime
 from src.models.User import User
 from src.DAL.UserService import UserService
-from src.config import get_test_config
-from src.query import init_pool, close_pool, query
-
-@pytest.fixture(scope="module")
-def setup_db():
-    """Initialize database connection for tests."""
-    config, _ = get_test_config()  # Unpack tuple, ignore connection string
-    init_pool(config)
-    
-    # Drop existing schema
-    cleanup_sql = """
-        DROP TYPE IF EXISTS role_enum CASCADE;
-        DROP TABLE IF EXISTS likes CASCADE;
-        DROP TABLE IF EXISTS vacations CASCADE;
-        DROP TABLE IF EXISTS users CASCADE;
-        DROP TABLE IF EXISTS countries CASCADE;
-    """
-    query(cleanup_sql, commit=True)
-    
-    # Initialize schema
-    with open('SQL/schema.sql', 'r') as f:
-        schema_sql = f.read()
-        query(schema_sql, commit=True)
-    
-    yield
-    close_pool()
-
-@pytest.fixture(autouse=True)
-def cleanup_users():
-    """Clean up users table after each test."""
-    yield
-    # Delete all users except the admin user
-    query = "DELETE FROM users WHERE email != 'admin@example.com'"
-    UserService._execute_query(query)
-
-def test_create_user(setup_db):
+from src.query import query
+
+def test_create_user():
     """Test creating a new user."""
     user = User(
         first_name="John",
@@ -54,7 +24,7 @@ def test_create_user(setup_db):
     assert saved_user.role_id == "user"
     assert isinstance(saved_user.created_at, datetime)
 
-def test_create_user_with_existing_email(setup_db):
+def test_create_user_with_existing_email():
     """Test creating a user with an existing email should fail."""
     user1 = User(
         first_name="John",
@@ -73,7 +43,7 @@ def test_create_user_with_existing_email(setup_db):
     with pytest.raises(Exception):  # Should raise a unique constraint violation
         UserService.create(user2)
 
-def test_get_by_id(setup_db):
+def test_get_by_id():
     """Test retrieving a user by ID."""
     original_user = User(
         first_name="Get",
@@ -88,13 +58,13 @@ def test_get_by_id(setup_db):
     assert retrieved_user.id == created_user.id
     assert retrieved_user.email == created_user.email
 
-def test_get_by_id_not_found(setup_db):
+def test_get_by_id_not_found():
     """Test retrieving a non-existent user by ID."""
     non_existent_id = 99999
     user = UserService.get_by_id(non_existent_id)
     assert user is None
 
-def test_get_by_email(setup_db):
+def test_get_by_email():
     """Test retrieving a user by email."""
     email = "get.by.email@example.com"
     original_user = User(
@@ -109,13 +79,13 @@ def test_get_by_email(setup_db):
     assert retrieved_user is not None
     assert retrieved_user.email == email
 
-def test_get_by_email_not_found(setup_db):
+def test_get_by_email_not_found():
     """Test retrieving a non-existent user by email."""
     non_existent_email = "nonexistent@example.com"
     user = UserService.get_by_email(non_existent_email)
     assert user is None
 
-def test_update_user(setup_db):
+def test_update_user():
     """Test updating a user's information."""
     user = User(
         first_name="Original",
@@ -134,7 +104,7 @@ def test_update_user(setup_db):
     assert updated_user.email == created_user.email
     assert updated_user.id == created_user.id
 
-def test_update_nonexistent_user(setup_db):
+def test_update_nonexistent_user():
     """Test updating a non-existent user."""
     user = User(
         id=99999,
@@ -145,7 +115,7 @@ def test_update_nonexistent_user(setup_db):
     with pytest.raises(ValueError):
         UserService.update(user)
 
-def test_delete_user(setup_db):
+def test_delete_user():
     """Test deleting a user."""
     user = User(
         first_name="Delete",
@@ -158,12 +128,12 @@ def test_delete_user(setup_db):
     assert UserService.delete(created_user.id) is True
     assert UserService.get_by_id(created_user.id) is None
 
-def test_delete_nonexistent_user(setup_db):
+def test_delete_nonexistent_user():
     """Test deleting a non-existent user."""
     non_existent_id = 99999
     assert UserService.delete(non_existent_id) is True  # Should return True even if user doesn't exist
 
-def test_update_password(setup_db):
+def test_update_password():
     """Test updating a user's password."""
     user = User(
         first_name="Password",
@@ -179,7 +149,7 @@ def test_update_password(setup_db):
     updated_user = UserService.get_by_id(created_user.id)
     assert updated_user.verify_password(new_password) is True
 
-def test_exists(setup_db):
+def test_exists():
     """Test checking if a user exists by email."""
     email = "exists.test@example.com"
     user = User(
@@ -193,7 +163,28 @@ def test_exists(setup_db):
     assert UserService.exists(email) is True
     assert UserService.exists("nonexistent@example.com") is False
 
-def test_count(setup_db):
+def test_create_many():
+    """Test creating several users in one statement."""
+    users = UserService.create_many([
+        User(first_name="Many", last_name="One", email="many1@example.com", password="password123"),
+        User(first_name="Many", last_name="Two", email="many2@example.com", password="password123",
+             role_id="admin")
+    ])
+    assert [u.email for u in users] == ["many1@example.com", "many2@example.com"]
+    assert all(u.id is not None for u in users)
+    assert users[1].role_id == "admin"
+    assert UserService.get_by_email("many1@example.com").verify_password("password123")
+    assert UserService.create_many([]) == []
+
+    # A duplicate email rolls back the whole batch
+    with pytest.raises(ValueError, match="Email already exists"):
+        UserService.create_many([
+            User(first_name="Many", last_name="Three", email="many3@example.com", password="password123"),
+            User(first_name="Many", last_name="Dup", email="MANY1@example.com", password="password123")
+        ])
+    assert UserService.get_by_email("many3@example.com") is None
+
+def test_count():
     """Test counting total number of users."""
     initial_count = UserService.count()
     
@@ -205,13 +196,12 @@ def test_count(setup_db):
              password="password123")
         for i in range(3)
     ]
-    for user in users:
-        UserService.create(user)
+    UserService.create_many(users)
     
     final_count = UserService.count()
     assert final_count == initial_count + 3
 
-def test_get_all(setup_db):
+def test_get_all():
     """Test retrieving all users."""
     # Create some test users
     test_users = [
@@ -221,8 +211,7 @@ def test_get_all(setup_db):
              password="password123")
         for i in range(3)
     ]
-    for user in test_users:
-        UserService.create(user)
+    UserService.create_many(test_users)
     
     all_users = UserService.get_all()
     assert len(all_users) >= 3  # There might be other users in the database
@@ -230,4 +219,143 @@ def test_get_all(setup_db):
     # Verify that our test users are in the results
     test_emails = {f"getall{i}@example.com" for i in range(3)}
     result_emails = {user.email for user in all_users}
-    assert test_emails.issubset(result_emails) 
\ No newline at end of file
+    assert test_emails.issubset(result_emails)
+
+def test_password_hashed_with_argon2id():
+    """Test that new passwords are hashed with Argon2id."""
+    user = User(
+        first_name="Argon",
+        last_name="Hash",
+        email="argon.hash@example.com",
+        password="password123"
+    )
+    assert user.password_hash.startswith("$argon2id$")
+    assert user.verify_password("password123") is True
+    assert user.verify_password("wrong_password") is False
+    assert user.needs_rehash() is False
+
+def test_tests_use_cheap_argon2_parameters():
+    """Test the suite hashes with the low-cost parameters set in conftest."""
+    user = User(
+        first_name="Cheap",
+        last_name="Hash",
+        email="cheap.hash@example.com",
+        password="password123"
+    )
+    assert "$m=8,t=1,p=1$" in user.password_hash
+
+def test_verify_legacy_bcrypt_password():
+    """Test that legacy bcrypt hashes still verify and are flagged for rehash."""
+    legacy_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(4)).decode('utf-8')
+    user = User.from_dict({
+        'first_name': "Legacy",
+        'last_name': "Hash",
+        'email': "legacy.hash@example.com",
+        'password': legacy_hash
+    })
+    assert user.verify_password("password123") is True
+    assert user.verify_password("wrong_password") is False
+    assert user.needs_rehash() is True
+
+def test_iter_all():
+    """Test lazily iterating over all users."""
+    for i in range(3):
+        UserService.create(User(
+            first_name=f"Iter{i}",
+            last_name="Test",
+            email=f"iter{i}@example.com",
+            password="password123"
+        ))
+
+    emails = {user.email for user in UserService.iter_all()}
+    assert {f"iter{i}@example.com" for i in range(3)}.issubset(emails)
+
+def test_user_from_db_row():
+    """Test creating a User from a trusted database row."""
+    now = datetime.now()
+    user = User.from_db_row({
+        'id': 1,
+        'first_name': "Row",
+        'last_name': "User",
+        'email': "row.user@example.com",
+        'password': "stored-hash",
+        'role_id': "admin",
+        'created_at': now
+    })
+
+    assert user.id == 1
+    assert user.full_name == "Row User"
+    assert user.role_id == "admin"
+    assert user.password_hash == "stored-hash"
+    assert user.created_at == now
+    assert not hasattr(user, '__dict__')
+
+def test_update_password_nonexistent_user():
+    """Test updating the password of a non-existent user."""
+    with pytest.raises(ValueError, match="User not found"):
+        UserService.update_password(99999, "newpassword123")
+
+def test_create_duplicate_email_raises_value_error():
+    """Test that a duplicate email surfaces as a ValueError."""
+    UserService.create(User(
+        first_name="First",
+        last_name="Dup",
+        email="dup.value@example.com",
+        password="password123"
+    ))
+    with pytest.raises(ValueError, match="Email already exists"):
+        UserService.create(User(
+            first_name="Second",
+            last_name="Dup",
+            email="dup.value@example.com",
+            password="password456"
+        ))
+
+def test_email_lookup_ignores_case():
+    """Test email lookups and uniqueness are case-insensitive."""
+    UserService.create(User(
+        first_name="Mixed",
+        last_name="Case",
+        email="Mixed.Case@Example.com",
+        password="password123"
+    ))
+
+    user = UserService.get_by_email("mixed.case@example.com")
+    assert user is not None
+    assert user.email == "Mixed.Case@Example.com"
+    assert UserService.exists("MIXED.CASE@EXAMPLE.COM")
+
+    with pytest.raises(ValueError, match="Email already exists"):
+        UserService.create(User(
+            first_name="Other",
+            last_name="Case",
+            email="mixed.case@example.com",
+            password="password456"
+        ))
+
+def test_email_has_single_unique_index():
+    """Test email uniqueness is enforced by the lower(email) index alone."""
+    result = query("SELECT indexname FROM pg_indexes WHERE tablename = 'users'")
+    names = {row['indexname'] for row in result}
+    assert 'idx_users_email_lower' in names
+    assert 'users_email_key' not in names
+
+def test_schema_rejects_existing_case_duplicate_emails():
+    """Test the schema names case-duplicate emails instead of failing on the index."""
+    schema_sql = (Path(__file__).resolve().parent.parent / 'SQL' / 'schema.sql').read_text()
+    # Simulate a database created before idx_users_email_lower existed
+    query("""
+        DROP INDEX idx_users_email_lower;
+        INSERT INTO users (first_name, last_name, email, password) VALUES
+            ('Case', 'One', 'Case.Dup@example.com', 'hash'),
+            ('Case', 'Two', 'case.dup@example.com', 'hash');
+    """, commit=True)
+    try:
+        with pytest.raises(psycopg.errors.RaiseException,
+                           match="Case.Dup@example.com, case.dup@example.com"):
+            query(schema_sql, commit=True)
+    finally:
+        query("""
+            DELETE FROM users WHERE lower(email) = 'case.dup@example.com';
+            CREATE UNIQUE INDEX idx_users_email_lower ON users (lower(email));
+        """, commit=True)
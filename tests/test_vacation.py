@@ -3,42 +3,10 @@ from datetime import datetime, date, timedelta
 from decimal import Decimal
 from src.models.Vacation import Vacation
 from src.models.Country import Country
+from src.DAL import VacationService as vacation_service_module
 from src.DAL.VacationService import VacationService
 from src.DAL.CountryService import CountryService
-from src.config import get_test_config
-from src.query import init_pool, close_pool, query
-
-@pytest.fixture(scope="session", autouse=True)
-def setup_db():
-    """Initialize database connection for tests."""
-    config, _ = get_test_config()
-    init_pool(config)
-    
-    # Drop existing schema
-    cleanup_sql = """
-        DROP TYPE IF EXISTS role_enum CASCADE;
-        DROP TABLE IF EXISTS likes CASCADE;
-        DROP TABLE IF EXISTS vacations CASCADE;
-        DROP TABLE IF EXISTS users CASCADE;
-        DROP TABLE IF EXISTS countries CASCADE;
-    """
-    query(cleanup_sql, commit=True)
-    
-    # Initialize schema
-    with open('SQL/schema.sql', 'r') as f:
-        schema_sql = f.read()
-        query(schema_sql, commit=True)
-    
-    yield
-    close_pool()
-
-@pytest.fixture(autouse=True)
-def cleanup_data():
-    """Clean up test data after each test."""
-    yield
-    query("DELETE FROM likes", commit=True)
-    query("DELETE FROM vacations", commit=True)
-    query("DELETE FROM countries WHERE code != 'US'", commit=True)  # Keep default country
+from src.query import query
 
 @pytest.fixture
 def test_country():
@@ -125,6 +93,29 @@ def test_vacation_validation(test_country, future_dates):
             price=Decimal("0")
         )
 
+def test_vacation_price_conversion(test_country, future_dates):
+    """Test int, float and string prices are converted to Decimal."""
+    for price, expected in [(100, Decimal("100")), (99.99, Decimal("99.99")), ("50.5", Decimal("50.50"))]:
+        vacation = Vacation(
+            country_id=test_country.id,
+            destination="Test Resort",
+            description="Test",
+            start_date=future_dates['start'],
+            end_date=future_dates['end'],
+            price=price
+        )
+        assert vacation.price == expected
+
+    with pytest.raises(ValueError, match="Price must be a decimal number"):
+        Vacation(
+            country_id=test_country.id,
+            destination="Test Resort",
+            description="Test",
+            start_date=future_dates['start'],
+            end_date=future_dates['end'],
+            price=True
+        )
+
 def test_vacation_to_dict(test_country, future_dates):
     """Test converting Vacation to dictionary."""
     vacation = Vacation(
@@ -171,6 +162,16 @@ def test_vacation_from_dict(test_country, future_dates):
     assert vacation.price == Decimal("999.99")
     assert vacation.country.id == test_country.id
 
+    data['start_date'] = "not-a-date"
+    with pytest.raises(ValueError, match="Invalid date format"):
+        Vacation.from_dict(data)
+
+    # Other ISO 8601 forms are rejected: compact and week dates
+    for value in ("20300101", "2030-W01-1"):
+        data['start_date'] = value
+        with pytest.raises(ValueError, match="Invalid date format"):
+            Vacation.from_dict(data)
+
 # Service Tests
 def test_create_vacation(test_country, future_dates):
     """Test creating a vacation in the database."""
@@ -277,11 +278,17 @@ def test_delete_vacation_with_likes(test_country, future_dates):
         price=Decimal("999.99")
     ))
     
-    # Create a like for this vacation
+    # Create a like for this vacation from a fresh user, since the schema's
+    # admin user may have been removed by earlier tests
+    user_id = query("""
+        INSERT INTO users (first_name, last_name, email, password)
+        VALUES ('Like', 'User', 'like.user@example.com', 'not-a-real-hash')
+        RETURNING id
+    """, commit=True)[0]['id']
     query("""
         INSERT INTO likes (user_id, vacation_id)
         VALUES (%s, %s)
-    """, [1, vacation.id], commit=True)
+    """, [user_id, vacation.id], commit=True)
     
     with pytest.raises(ValueError, match="Cannot delete vacation with associated likes"):
         VacationService.delete(vacation.id)
@@ -378,4 +385,216 @@ def test_count_vacations(test_country, future_dates):
     assert VacationService.count() == initial_count + 3
     
     # Test count by country
-    assert VacationService.count(country_id=test_country.id) == 3 
\ No newline at end of file
+    assert VacationService.count(country_id=test_country.id) == 3
+
+def test_update_vacation_invalid_country(test_country, future_dates):
+    """Test updating a vacation to a non-existent country."""
+    vacation = VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Test Resort",
+        description="A lovely resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+
+    vacation.country_id = 999
+    with pytest.raises(ValueError, match="Country with id 999 not found"):
+        VacationService.update(vacation)
+
+def test_delete_nonexistent_vacation():
+    """Test deleting a vacation that doesn't exist."""
+    assert VacationService.delete(999999) is False
+
+def test_get_all_cached_until_write(test_country, future_dates):
+    """Test get_all and count are cached and invalidated by service writes."""
+    vacation = VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Cached Resort",
+        description="A lovely resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+    assert len(VacationService.get_all(country_id=test_country.id)) == 1
+    assert VacationService.count(country_id=test_country.id) == 1
+
+    # A write behind the service's back is not seen until the cache is cleared
+    query("DELETE FROM vacations WHERE id = %s", [vacation.id], commit=True)
+    assert len(VacationService.get_all(country_id=test_country.id)) == 1
+    assert VacationService.count(country_id=test_country.id) == 1
+    VacationService.clear_cache()
+    assert VacationService.get_all(country_id=test_country.id) == []
+    assert VacationService.count(country_id=test_country.id) == 0
+
+    # Writes through the service invalidate the cache
+    VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Another Resort",
+        description="Another lovely resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+    assert len(VacationService.get_all(country_id=test_country.id)) == 1
+    assert VacationService.count(country_id=test_country.id) == 1
+
+def test_get_all_cached_copies(test_country, future_dates):
+    """Test cached get_all results are independent objects for each caller."""
+    VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Cached Resort",
+        description="A lovely resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+    first = VacationService.get_all(country_id=test_country.id)
+    first[0].destination = "Mutated Locally"
+
+    second = VacationService.get_all(country_id=test_country.id)
+    assert second[0].destination == "Cached Resort"
+    assert second[0] is not first[0]
+
+def test_vacation_listing_indexes_exist():
+    """Test the schema creates the indexes used by get_all filters and sorting."""
+    result = query("SELECT indexname FROM pg_indexes WHERE tablename = 'vacations'")
+    names = {row['indexname'] for row in result}
+    assert {'idx_vacations_country_start', 'idx_vacations_start_date',
+            'idx_vacations_price'} <= names
+    assert 'idx_vacations_country_id' not in names
+
+def test_count_vacations_estimate(test_country, future_dates):
+    """Test the planner-estimate count after the table is analyzed."""
+    for i in range(3):
+        VacationService.create(Vacation(
+            country_id=test_country.id,
+            destination=f"Resort {i}",
+            description=f"Description {i}",
+            start_date=future_dates['start'],
+            end_date=future_dates['end'],
+            price=Decimal("999.99")
+        ))
+    query("ANALYZE vacations", commit=True)
+
+    assert VacationService.count(estimate=True) == VacationService.count()
+    # Filtered counts are always exact
+    assert VacationService.count(country_id=test_country.id, estimate=True) == 3
+
+def test_iter_all_vacations(test_country, future_dates):
+    """Test lazily iterating over all vacations."""
+    for i in range(3):
+        VacationService.create(Vacation(
+            country_id=test_country.id,
+            destination=f"Stream Resort {i}",
+            description=f"Description {i}",
+            start_date=future_dates['start'] + timedelta(days=i),
+            end_date=future_dates['end'] + timedelta(days=i),
+            price=Decimal("999.99")
+        ))
+
+    streamed = list(VacationService.iter_all())
+    assert [v.id for v in streamed] == [v.id for v in VacationService.get_all()]
+    assert all(v.country.code == test_country.code for v in streamed
+               if v.country_id == test_country.id)
+
+def test_vacation_from_db_row():
+    """Test creating a Vacation from a trusted database row."""
+    country = Country(name="Test Country", code="TC", id=7)
+    past = date.today() - timedelta(days=365)
+    vacation = Vacation.from_db_row({
+        'id': 1,
+        'country_id': 7,
+        'destination': "Old Resort",
+        'description': "Already happened",
+        'start_date': past,
+        'end_date': past + timedelta(days=7),
+        'price': Decimal("999.99"),
+        'image_url': None,
+        'created_at': None
+    }, country)
+
+    # Past dates are accepted since database rows are not re-validated
+    assert vacation.start_date == past
+    assert vacation.country is country
+    assert vacation.created_at is not None
+    assert not hasattr(vacation, '__dict__')
+
+def test_get_by_id_cached_copy(test_country, future_dates):
+    """Test get_by_id is cached but callers get independent objects."""
+    vacation = VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Cached Resort",
+        description="A lovely resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+    first = VacationService.get_by_id(vacation.id)
+    first.destination = "Mutated Locally"
+
+    query("UPDATE vacations SET price = 1.00 WHERE id = %s", [vacation.id], commit=True)
+    second = VacationService.get_by_id(vacation.id)
+    assert second.destination == "Cached Resort"
+    assert second.price == Decimal("999.99")
+
+    # Service writes invalidate the cached row
+    second.price = Decimal("500.00")
+    VacationService.update(second)
+    assert VacationService.get_by_id(vacation.id).price == Decimal("500.00")
+
+def test_search_does_not_span_fields(test_country, future_dates):
+    """Test a search term cannot match across destination and description."""
+    VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Beach Resort",
+        description="A lovely beach resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+
+    assert len(VacationService.search("lovely beach")) == 1
+    assert VacationService.search("Resort A lovely") == []
+
+def test_get_with_like_info(test_country, future_dates):
+    """Test fetching a vacation with like information in one query."""
+    vacation = VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Liked Resort",
+        description="A lovely resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+
+    found, likes_count, is_liked = VacationService.get_with_like_info(vacation.id, 1)
+    assert found.id == vacation.id
+    assert found.country.code == test_country.code
+    assert (likes_count, is_liked) == (0, False)
+    assert VacationService.get_with_like_info(999999, 1) is None
+
+def test_cache_skips_put_after_invalidation(test_country, future_dates, monkeypatch):
+    """Test a result read before a concurrent write is not cached after it."""
+    vacation = VacationService.create(Vacation(
+        country_id=test_country.id,
+        destination="Racing Resort",
+        description="A lovely resort",
+        start_date=future_dates['start'],
+        end_date=future_dates['end'],
+        price=Decimal("999.99")
+    ))
+    real_query = vacation_service_module.query
+    
+    def query_then_invalidate(*args, **kwargs):
+        result = real_query(*args, **kwargs)
+        VacationService.clear_cache()  # A write lands between the SELECT and the put
+        return result
+    
+    monkeypatch.setattr(vacation_service_module, 'query', query_then_invalidate)
+    VacationService.get_all(country_id=test_country.id)
+    VacationService.count(country_id=test_country.id)
+    VacationService.get_by_id(vacation.id)
+    monkeypatch.undo()
+    
+    assert vacation_service_module._cache == {}
@@ -28,9 +28,9 @@ def setup_countries():
     # Cleanup is handled by conftest.py cleanup_test_data fixture
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def vacation_facade():
-    """Create VacationFacade instance."""
+    """Create VacationFacade instance; it holds no per-test state."""
     return VacationFacade()
 
 
@@ -127,6 +127,12 @@ def test_get_vacation_with_likes(vacation_facade, test_vacation, test_user):
     assert vacation['likes_count'] == 1
 
 
+def test_get_vacation_with_user_not_found(vacation_facade, test_user):
+    """Test getting a non-existent vacation with like information."""
+    with pytest.raises(ValueError, match="Vacation not found"):
+        vacation_facade.get_vacation(999999, test_user.id)
+
+
 def test_update_vacation(vacation_facade, test_vacation):
     """Test updating a vacation."""
     updated = vacation_facade.update_vacation(
@@ -140,6 +146,19 @@ def test_update_vacation(vacation_facade, test_vacation):
     assert updated['id'] == test_vacation['id']
 
 
+def test_update_vacation_reads_fresh_row(vacation_facade, test_vacation):
+    """Test updates don't write back fields from a stale cached row."""
+    vacation_facade.get_vacation(test_vacation['id'])  # Caches the row
+    query("UPDATE vacations SET description = 'Changed elsewhere' WHERE id = %s",
+          [test_vacation['id']], commit=True)
+    
+    updated = vacation_facade.update_vacation(
+        test_vacation['id'],
+        price=Decimal("2000.00")
+    )
+    assert updated['description'] == "Changed elsewhere"
+
+
 def test_update_vacation_invalid_country(vacation_facade, test_vacation):
     """Test updating a vacation with invalid country code."""
     with pytest.raises(ValueError, match="Invalid country code: XX"):
@@ -248,22 +267,20 @@ def test_get_popular_vacations(vacation_facade, test_user):
     )
     
     # Create additional test users and like vacations
-    users = []
-    for i in range(3):
-        user = User(
+    users = UserService.create_many([
+        User(
             first_name=f"Test{i}",
             last_name="User",
             email=f"test{i}@example.com",
             password="password123"
         )
-        users.append(UserService.create(user))
-    
-    # More likes for vacation1
-    for user in users:
-        vacation_facade.like_vacation(user.id, vacation1['id'])
+        for i in range(3)
+    ])
     
-    # Fewer likes for vacation2
-    vacation_facade.like_vacation(users[0].id, vacation2['id'])
+    # More likes for vacation1, fewer for vacation2
+    vacation_facade.bulk_like(users[0].id, [vacation1['id'], vacation2['id']])
+    for user in users[1:]:
+        vacation_facade.bulk_like(user.id, [vacation1['id']])
     
     # Get popular vacations
     popular = vacation_facade.get_popular_vacations(limit=2)
@@ -275,6 +292,23 @@ def test_get_popular_vacations(vacation_facade, test_user):
     assert popular[1]['likes_count'] == 1
 
 
+def test_liked_and_popular_include_past_vacations(vacation_facade, test_user, test_vacation):
+    """Test vacations that have already started are still listed."""
+    query(
+        "UPDATE vacations SET start_date = %s WHERE id = %s",
+        [date.today() - timedelta(days=5), test_vacation['id']],
+        commit=True
+    )
+    vacation_facade.like_vacation(test_user.id, test_vacation['id'])
+
+    liked = vacation_facade.get_user_liked_vacations(test_user.id)
+    assert [v['id'] for v in liked] == [test_vacation['id']]
+    assert liked[0]['start_date'] == date.today() - timedelta(days=5)
+
+    popular = vacation_facade.get_popular_vacations()
+    assert [v['id'] for v in popular] == [test_vacation['id']]
+
+
 def test_search_vacations(vacation_facade, test_user):
     """Test searching vacations with filters."""
     # Create test vacations
@@ -323,3 +357,62 @@ def test_search_vacations(vacation_facade, test_user):
     )
     assert len(results) == 1
     assert results[0]['id'] == vacation1['id']
+
+
+def test_search_vacations_like_info(vacation_facade, test_user):
+    """Test search results carry like counts and status for the user."""
+    liked = vacation_facade.create_vacation(
+        country_code="FR",
+        destination="Paris",
+        description="City of light",
+        start_date=date.today() + timedelta(days=10),
+        end_date=date.today() + timedelta(days=15),
+        price=Decimal("1000.00")
+    )
+    other = vacation_facade.create_vacation(
+        country_code="FR",
+        destination="Nice",
+        description="Riviera",
+        start_date=date.today() + timedelta(days=20),
+        end_date=date.today() + timedelta(days=25),
+        price=Decimal("1000.00")
+    )
+    vacation_facade.like_vacation(test_user.id, liked['id'])
+
+    results = vacation_facade.search_vacations(country_code="FR", user_id=test_user.id)
+    assert [(r['id'], r['is_liked'], r['likes_count']) for r in results] == [
+        (liked['id'], True, 1),
+        (other['id'], False, 0)
+    ]
+
+    # Without a user no like information is added
+    results = vacation_facade.search_vacations(country_code="FR")
+    assert all('is_liked' not in r for r in results)
+
+
+def test_like_unlike_nonexistent_vacation(vacation_facade, test_user):
+    """Test liking or unliking a vacation that doesn't exist."""
+    with pytest.raises(ValueError, match="Vacation not found: 999999"):
+        vacation_facade.like_vacation(test_user.id, 999999)
+    with pytest.raises(ValueError, match="Vacation not found: 999999"):
+        vacation_facade.unlike_vacation(test_user.id, 999999)
+
+
+def test_bulk_like(vacation_facade, test_user):
+    """Test liking several vacations in one call."""
+    ids = [
+        vacation_facade.create_vacation(
+            country_code="IT",
+            destination=f"Bulk Destination {i}",
+            description="Bulk",
+            start_date=date.today() + timedelta(days=10),
+            end_date=date.today() + timedelta(days=15),
+            price=Decimal("100.00")
+        )['id']
+        for i in range(3)
+    ]
+    vacation_facade.like_vacation(test_user.id, ids[0])
+
+    created = vacation_facade.bulk_like(test_user.id, ids)
+    assert sorted(like['vacation_id'] for like in created) == ids[1:]
+    assert {v['id'] for v in vacation_facade.get_user_liked_vacations(test_user.id)} == set(ids)